@@ -12,15 +12,14 @@ import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)) + '/..')
 
 # Import models and config
-from database import Base
+from database import Base, script_engine
 from models import User, Course, Assignment, Submission, OTP
-from config import settings
 
 # this is the Alembic Config object
 config = context.config
 
-# Override sqlalchemy.url with our DATABASE_URL
-config.set_main_option('sqlalchemy.url', settings.DATABASE_URL)
+# Override sqlalchemy.url with our DATABASE_URL (with the app's driver applied)
+config.set_main_option('sqlalchemy.url', script_engine.url.render_as_string(hide_password=False))
 
 # Interpret the config file for Python logging
 if config.config_file_name is not None:
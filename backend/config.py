@@ -2,6 +2,7 @@
 Configuration management for the application.
 Uses pydantic-settings for environment variable validation.
 """
+from functools import cached_property, lru_cache
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from typing import List
 
@@ -11,16 +12,30 @@ class Settings(BaseSettings):
     
     # Database
     DATABASE_URL: str
+    # Connection pool sizing; a good starting point is (cores * 2) + disks
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_RECYCLE_SECONDS: int = 1800
     
     # JWT Authentication
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
+    # How long a resolved user may be served from the per-worker auth cache;
+    # also the longest a role change made outside the API takes to apply
+    USER_CACHE_TTL_SECONDS: int = 60
+    USER_CACHE_MAX_ENTRIES: int = 10000
     
     # OTP
     OTP_EXPIRE_MINUTES: int = 5
     
+    # Largest accepted assignment upload
+    MAX_UPLOAD_SIZE_MB: int = 50
+    
+    # Worker processes for password hashing and RSA/AES work (0 = one per CPU)
+    CRYPTO_WORKERS: int = 0
+    
     # CORS
     CORS_ORIGINS: str = "http://localhost:5173"
     
@@ -33,11 +48,27 @@ class Settings(BaseSettings):
         case_sensitive=True
     )
     
-    @property
+    @cached_property
     def cors_origins_list(self) -> List[str]:
-        """Parse CORS origins from comma-separated string."""
+        """Parse CORS origins from comma-separated string (computed once)."""
         return [origin.strip() for origin in self.CORS_ORIGINS.split(",")]
+    
+    @cached_property
+    def max_upload_bytes(self) -> int:
+        """MAX_UPLOAD_SIZE_MB in bytes."""
+        return self.MAX_UPLOAD_SIZE_MB * 1024 * 1024
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    Get the application settings.
+    
+    The environment and .env file are parsed and validated only on the
+    first call; later calls return the same instance.
+    """
+    return Settings()
 
 
-# Global settings instance
-settings = Settings()
+# Global settings instance (kept for existing `from config import settings` imports)
+settings = get_settings()
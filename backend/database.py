@@ -1,32 +1,58 @@
 """
 Database connection and session management using SQLAlchemy.
+API requests use an async engine/session; CLI scripts use a sync one.
 """
 from sqlalchemy import create_engine
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 from config import settings
 
-# Create database engine
-engine = create_engine(
-    settings.DATABASE_URL,
+
+def _engine_url(url: str) -> URL:
+    """Use the psycopg (v3) driver for plain postgresql:// URLs."""
+    parsed = make_url(url)
+    if parsed.drivername == "postgresql":
+        parsed = parsed.set(drivername="postgresql+psycopg")
+    return parsed
+
+
+# Create async database engine (pooled, shared by all API requests).
+# psycopg 3 drives both the sync and the async engine.
+engine = create_async_engine(
+    _engine_url(settings.DATABASE_URL),
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,  # Replace connections before server-side timeouts
     pool_pre_ping=True,  # Verify connections before using
+    insertmanyvalues_page_size=1000,  # Batch executemany() INSERTs into multi-row VALUES
     echo=settings.DEBUG  # Log SQL queries in debug mode
 )
 
-# Session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Unpooled engine for one-shot CLI scripts (seeding, admin tools) so they
+# don't hold idle connections open
+script_engine = create_engine(
+    _engine_url(settings.DATABASE_URL),
+    poolclass=NullPool,
+    insertmanyvalues_page_size=1000,
+    echo=settings.DEBUG
+)
+
+# Session factories. expire_on_commit=False: after a commit, attributes stay
+# readable without an (awaited) reload
+SessionLocal = async_sessionmaker(engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+ScriptSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=script_engine)
 
 # Base class for models
 Base = declarative_base()
 
 
-def get_db():
+async def get_db():
     """
-    Dependency function to get database session.
+    Dependency function to get an async database session.
     Ensures proper cleanup after request completion.
     """
-    db = SessionLocal()
-    try:
+    async with SessionLocal() as db:
         yield db
-    finally:
-        db.close()
@@ -4,7 +4,7 @@ Run this to identify why you're getting 403 Forbidden.
 """
 import sys
 from sqlalchemy.orm import Session
-from database import SessionLocal
+from database import ScriptSessionLocal
 from models.user import User, UserRole
 from utils.auth import verify_token
 
@@ -31,9 +31,10 @@ def check_token(token: str):
         print("❌ Token payload missing 'user_id'")
         return
     
-    db = SessionLocal()
+    db = ScriptSessionLocal()
     try:
-        user = db.query(User).filter(User.id == user_id).first()
+        # Only the columns we print - skips the PEM key blobs
+        user = db.query(User.email, User.name, User.role).filter(User.id == user_id).first()
         
         if not user:
             print(f"❌ User not found in database (ID: {user_id})")
@@ -69,19 +70,22 @@ def list_all_users():
     print("👥 ALL USERS IN DATABASE")
     print("="*70)
     
-    db = SessionLocal()
+    db = ScriptSessionLocal()
     try:
-        users = db.query(User).all()
+        # Only the columns we print - skips the PEM key blobs
+        users = db.query(User.email, User.name, User.role).all()
         
         if not users:
             print("No users found in database.")
             return
         
-        print(f"\nTotal users: {len(users)}\n")
-        
+        lines = [f"\nTotal users: {len(users)}\n"]
         for user in users:
             role_indicator = "👑" if user.role == UserRole.ADMIN else "👨‍🏫" if user.role == UserRole.FACULTY else "🎓"
-            print(f"{role_indicator} {user.email:<30} | Role: {user.role.value:<10} | Name: {user.name}")
+            lines.append(f"{role_indicator} {user.email:<30} | Role: {user.role.value:<10} | Name: {user.name}")
+        
+        # Single write instead of one print() per user
+        sys.stdout.write("\n".join(lines) + "\n")
     
     finally:
         db.close()
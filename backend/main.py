@@ -2,10 +2,35 @@
 FastAPI main application.
 Secure Student Assignment Submission System with encryption and digital signatures.
 """
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+import orjson
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from config import settings
+from fastapi.responses import ORJSONResponse
+from config import get_settings
+from database import engine
 from routes import auth_router, student_router, faculty_router, admin_router
+from utils.keypair_pool import keypair_pool
+from utils.cpu_pool import cpu_pool
+from utils.http_cache import make_etag
+from utils.log_queue import start_logging, stop_logging
+
+settings = get_settings()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start background logging, the crypto worker processes and the RSA key pair pool."""
+    # Root logger at INFO in production; DEBUG adds the security walkthrough
+    start_logging(debug=settings.DEBUG)
+    cpu_pool.start(settings.CRYPTO_WORKERS)
+    keypair_pool.start()
+    yield
+    await keypair_pool.stop()
+    cpu_pool.shutdown()
+    await engine.dispose()
+    stop_logging()
+
 
 # Create FastAPI app
 app = FastAPI(
@@ -13,7 +38,9 @@ app = FastAPI(
     description="Production-ready system with authentication, encryption, and digital signatures",
     version="1.0.0",
     docs_url="/api/docs",
-    redoc_url="/api/redoc"
+    redoc_url="/api/redoc",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 # CORS middleware
@@ -32,20 +59,30 @@ app.include_router(faculty_router, prefix="/api")
 app.include_router(admin_router, prefix="/api")
 
 
+# Static responses are serialized once at import time
+_ROOT_BYTES = orjson.dumps({
+    "message": "Secure Student Assignment Submission System API",
+    "version": "1.0.0",
+    "docs": "/api/docs"
+})
+_ROOT_ETAG = make_etag(_ROOT_BYTES)
+_HEALTH_BYTES = orjson.dumps({"status": "healthy"})
+
+
 @app.get("/")
-def root():
+def root(request: Request):
     """Root endpoint."""
-    return {
-        "message": "Secure Student Assignment Submission System API",
-        "version": "1.0.0",
-        "docs": "/api/docs"
-    }
+    headers = {"ETag": _ROOT_ETAG, "Cache-Control": "public, max-age=3600"}
+    if request.headers.get("if-none-match") == _ROOT_ETAG:
+        return Response(status_code=304, headers=headers)
+    return Response(content=_ROOT_BYTES, media_type="application/json", headers=headers)
 
 
 @app.get("/api/health")
 def health_check():
     """Health check endpoint."""
-    return {"status": "healthy"}
+    # Never cached - a proxy answering for us would hide an outage
+    return Response(content=_HEALTH_BYTES, media_type="application/json", headers={"Cache-Control": "no-store"})
 
 
 if __name__ == "__main__":
@@ -3,30 +3,41 @@ Quick tool to promote a user to admin role.
 Usage: python make_admin.py <email>
 """
 import sys
-from database import SessionLocal
+from sqlalchemy import update
+from database import ScriptSessionLocal
 from models.user import User, UserRole
 
 def make_admin(email: str):
     """Promote a user to admin role."""
-    db = SessionLocal()
+    db = ScriptSessionLocal()
     try:
-        user = db.query(User).filter(User.email == email).first()
+        # Promote in a single round trip. The self-join exposes the row as it
+        # was before the UPDATE, so RETURNING can report the previous role.
+        users = User.__table__
+        old = users.alias("old")
+        promoted = db.execute(
+            update(users)
+            .where(users.c.id == old.c.id, old.c.email == email, old.c.role != UserRole.ADMIN)
+            .values(role=UserRole.ADMIN)
+            .returning(old.c.role)
+        ).first()
+        db.commit()
         
-        if not user:
+        if promoted is None:
+            # Nothing updated - find out why
+            role = db.query(User.role).filter(User.email == email).scalar()
+            if role == UserRole.ADMIN:
+                print(f"✅ {email} is already an admin")
+                return
+            
             print(f"❌ User not found: {email}")
             print("\nAvailable users:")
-            all_users = db.query(User).all()
+            all_users = db.query(User.email, User.role).all()
             for u in all_users:
                 print(f"  - {u.email} ({u.role.value})")
             return
         
-        if user.role == UserRole.ADMIN:
-            print(f"✅ {email} is already an admin")
-            return
-        
-        old_role = user.role.value
-        user.role = UserRole.ADMIN
-        db.commit()
+        old_role = promoted.role.value
         
         print(f"✅ Successfully promoted {email}")
         print(f"   Old role: {old_role}")
@@ -0,0 +1,38 @@
+"""Index assignments.student_id and assignments.course_id
+
+Revision ID: add_assignment_fk_indexes
+Revises: hash_otp_codes
+Create Date: 2026-10-15 16:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_assignment_fk_indexes'
+down_revision = 'hash_otp_codes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # get_my_submissions filters by student, get_assigned_submissions joins
+    # by course. Built CONCURRENTLY so uploads aren't blocked on a large
+    # table, which can't run inside the migration transaction.
+    # (submissions.assignment_id is already covered by its unique index, and
+    # otp by the partial ix_otp_lookup.)
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_assignments_student_id', 'assignments', ['student_id'],
+            postgresql_concurrently=True
+        )
+        op.create_index(
+            'ix_assignments_course_id', 'assignments', ['course_id'],
+            postgresql_concurrently=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_assignments_course_id', table_name='assignments', postgresql_concurrently=True)
+        op.drop_index('ix_assignments_student_id', table_name='assignments', postgresql_concurrently=True)
@@ -0,0 +1,31 @@
+"""Add courses.faculty_id index and covering users email index
+
+Revision ID: add_lookup_indexes
+Revises: user_role_varchar
+Create Date: 2026-10-15 11:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_lookup_indexes'
+down_revision = 'user_role_varchar'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Courses are looked up by their assigned faculty
+    op.create_index('ix_courses_faculty_id', 'courses', ['faculty_id'])
+    
+    # Login reads these columns by email; INCLUDE allows index-only scans
+    op.create_index(
+        'ix_users_email_covering', 'users', ['email'],
+        postgresql_include=['id', 'role', 'name', 'password_hash', 'mfa_enabled']
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_users_email_covering', table_name='users')
+    op.drop_index('ix_courses_faculty_id', table_name='courses')
@@ -0,0 +1,30 @@
+"""Add partial covering index for OTP verification lookups
+
+Revision ID: add_otp_lookup_index
+Revises: server_side_uuid_defaults
+Create Date: 2026-10-15 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_otp_lookup_index'
+down_revision = 'server_side_uuid_defaults'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Newest unused OTP for (user_id, otp_code) becomes a single index seek
+    op.create_index(
+        'ix_otp_lookup', 'otp',
+        ['user_id', 'otp_code', sa.text('created_at DESC')],
+        postgresql_where=sa.text('is_used = false'),
+        postgresql_include=['id', 'expiry_timestamp', 'is_used']
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_otp_lookup', table_name='otp')
@@ -0,0 +1,25 @@
+"""Store encrypted assignment blobs uncompressed (STORAGE EXTERNAL)
+
+Revision ID: assignment_blob_storage_external
+Revises: add_assignment_fk_indexes
+Create Date: 2026-10-15 17:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'assignment_blob_storage_external'
+down_revision = 'add_assignment_fk_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # AES ciphertext doesn't compress; skip pglz on write and read. Only a
+    # catalog change: existing rows keep their current TOAST representation.
+    op.execute('ALTER TABLE assignments ALTER COLUMN encrypted_file_blob SET STORAGE EXTERNAL')
+
+
+def downgrade() -> None:
+    op.execute('ALTER TABLE assignments ALTER COLUMN encrypted_file_blob SET STORAGE EXTENDED')
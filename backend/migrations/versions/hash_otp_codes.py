@@ -0,0 +1,44 @@
+"""Store OTP codes as HMAC-SHA256 digests
+
+Revision ID: hash_otp_codes
+Revises: unlogged_otp_table
+Create Date: 2026-10-15 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'hash_otp_codes'
+down_revision = 'unlogged_otp_table'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Outstanding plaintext codes can't be converted without the app's
+    # SECRET_KEY; they live 5 minutes, so users just request a new one
+    op.execute('DELETE FROM otp')
+    op.drop_index('ix_otp_lookup', table_name='otp')
+    op.drop_column('otp', 'otp_code')
+    op.add_column('otp', sa.Column('otp_hash', sa.LargeBinary(), nullable=False))
+    op.create_index(
+        'ix_otp_lookup', 'otp',
+        ['user_id', 'otp_hash', sa.text('created_at DESC')],
+        postgresql_where=sa.text('is_used = false'),
+        postgresql_include=['id', 'expiry_timestamp', 'is_used']
+    )
+
+
+def downgrade() -> None:
+    op.execute('DELETE FROM otp')
+    op.drop_index('ix_otp_lookup', table_name='otp')
+    op.drop_column('otp', 'otp_hash')
+    op.add_column('otp', sa.Column('otp_code', sa.String(length=6), nullable=False))
+    op.create_index(
+        'ix_otp_lookup', 'otp',
+        ['user_id', 'otp_code', sa.text('created_at DESC')],
+        postgresql_where=sa.text('is_used = false'),
+        postgresql_include=['id', 'expiry_timestamp', 'is_used']
+    )
@@ -0,0 +1,29 @@
+"""Generate primary key UUIDs server-side with gen_random_uuid()
+
+Revision ID: server_side_uuid_defaults
+Revises: add_lookup_indexes
+Create Date: 2026-10-15 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'server_side_uuid_defaults'
+down_revision = 'add_lookup_indexes'
+branch_labels = None
+depends_on = None
+
+TABLES = ['users', 'courses', 'assignments', 'submissions', 'otp']
+
+
+def upgrade() -> None:
+    # INSERTs can omit id; gen_random_uuid() is built in since PostgreSQL 13
+    for table in TABLES:
+        op.alter_column(table, 'id', server_default=sa.text('gen_random_uuid()'))
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        op.alter_column(table, 'id', server_default=None)
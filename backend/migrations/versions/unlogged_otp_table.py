@@ -0,0 +1,24 @@
+"""Make the OTP table UNLOGGED
+
+Revision ID: unlogged_otp_table
+Revises: add_otp_lookup_index
+Create Date: 2026-10-15 14:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'unlogged_otp_table'
+down_revision = 'add_otp_lookup_index'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Short-lived OTP rows don't need crash durability; skip WAL for them
+    op.execute('ALTER TABLE otp SET UNLOGGED')
+
+
+def downgrade() -> None:
+    op.execute('ALTER TABLE otp SET LOGGED')
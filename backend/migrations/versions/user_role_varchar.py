@@ -0,0 +1,39 @@
+"""Store users.role as VARCHAR with a CHECK constraint
+
+Revision ID: user_role_varchar
+Revises: add_totp_mfa_fields
+Create Date: 2026-10-15 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'user_role_varchar'
+down_revision = 'add_totp_mfa_fields'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Native ENUM stored member names ('ADMIN'); the new column stores values ('admin')
+    op.alter_column(
+        'users', 'role',
+        type_=sa.String(16),
+        existing_nullable=False,
+        postgresql_using='lower(role::text)'
+    )
+    op.execute('DROP TYPE IF EXISTS userrole')
+    op.create_check_constraint('ck_users_role', 'users', "role IN ('student', 'faculty', 'admin')")
+
+
+def downgrade() -> None:
+    op.drop_constraint('ck_users_role', 'users', type_='check')
+    op.execute("CREATE TYPE userrole AS ENUM ('STUDENT', 'FACULTY', 'ADMIN')")
+    op.alter_column(
+        'users', 'role',
+        type_=sa.Enum('STUDENT', 'FACULTY', 'ADMIN', name='userrole'),
+        existing_nullable=False,
+        postgresql_using='upper(role)::userrole'
+    )
@@ -2,10 +2,9 @@
 Assignment model with hybrid encryption support.
 Files are encrypted using AES-256, with the AES key encrypted using RSA.
 """
-import uuid
-from sqlalchemy import Column, String, ForeignKey, DateTime, LargeBinary, Text
+from sqlalchemy import Column, String, ForeignKey, DateTime, LargeBinary, Text, DDL, event
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, deferred
 from sqlalchemy.sql import func
 from database import Base
 
@@ -29,21 +28,23 @@ class Assignment(Base):
     """
     __tablename__ = "assignments"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=func.gen_random_uuid())
     
-    # Student and course references
-    student_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
-    course_id = Column(UUID(as_uuid=True), ForeignKey("courses.id"), nullable=False)
+    # Student and course references (indexed: submissions are listed per
+    # student and per course)
+    student_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True)
+    course_id = Column(UUID(as_uuid=True), ForeignKey("courses.id"), nullable=False, index=True)
     
     # File information
     filename = Column(String(255), nullable=False)
     
     # Encrypted file storage (BYTEA for binary data)
-    encrypted_file_blob = Column(LargeBinary, nullable=False)
+    # Deferred: only the download reads the file, and it selects it explicitly
+    encrypted_file_blob = deferred(Column(LargeBinary, nullable=False))
     
     # File integrity and encryption
     file_hash_sha256 = Column(String(64), nullable=False)  # SHA-256 produces 64 hex chars
-    aes_key_encrypted = Column(Text, nullable=False)  # RSA-encrypted AES key (Base64)
+    aes_key_encrypted = deferred(Column(Text, nullable=False))  # RSA-encrypted AES key (Base64)
     
     upload_timestamp = Column(DateTime(timezone=True), server_default=func.now())
     
@@ -53,3 +54,13 @@ class Assignment(Base):
     
     def __repr__(self):
         return f"<Assignment {self.filename} by {self.student_id}>"
+
+
+# Ciphertext is incompressible: EXTERNAL storage keeps it out-of-line (TOAST)
+# but skips the pglz compression attempt on every upload and the decompression
+# pass on every read
+event.listen(
+    Assignment.__table__,
+    "after_create",
+    DDL("ALTER TABLE assignments ALTER COLUMN encrypted_file_blob SET STORAGE EXTERNAL")
+)
@@ -1,9 +1,9 @@
 """
 Course model for assignment organization and faculty assignment.
 """
-import uuid
 from sqlalchemy import Column, String, ForeignKey
 from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from database import Base
 
@@ -15,12 +15,12 @@ class Course(Base):
     """
     __tablename__ = "courses"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=func.gen_random_uuid())
     name = Column(String(255), nullable=False)
     code = Column(String(50), unique=True, nullable=False, index=True)
     
     # Faculty assignment
-    faculty_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=True)
+    faculty_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=True, index=True)
     
     # Relationships
     faculty = relationship("User", foreign_keys=[faculty_id])
@@ -2,8 +2,7 @@
 OTP model for multi-factor authentication.
 OTPs are time-limited and single-use.
 """
-import uuid
-from sqlalchemy import Column, String, ForeignKey, DateTime, Boolean
+from sqlalchemy import Column, ForeignKey, DateTime, Boolean, Index, LargeBinary
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -15,7 +14,7 @@ class OTP(Base):
     One-Time Password model for MFA.
     
     Security features:
-    - 6-digit numeric code
+    - 6-digit numeric code, stored only as an HMAC-SHA256 digest
     - Time-limited (5 minutes default)
     - Single-use (marked as used after verification)
     - User-specific
@@ -29,11 +28,11 @@ class OTP(Base):
     """
     __tablename__ = "otp"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=func.gen_random_uuid())
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     
-    # OTP code (6-digit numeric)
-    otp_code = Column(String(6), nullable=False)
+    # HMAC-SHA256 of the 6-digit code (see utils.otp.hash_otp)
+    otp_hash = Column(LargeBinary(32), nullable=False)
     
     # Expiry and usage tracking
     expiry_timestamp = Column(DateTime(timezone=True), nullable=False)
@@ -41,6 +40,21 @@ class OTP(Base):
     
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
+    # verify_otp looks up the newest unused code for a user; the partial index
+    # only holds unused OTPs and covers every column that query reads
+    __table_args__ = (
+        Index(
+            "ix_otp_lookup",
+            user_id, otp_hash, created_at.desc(),
+            postgresql_where=(is_used == False),
+            postgresql_include=["id", "expiry_timestamp", "is_used"]
+        ),
+        # OTPs are disposable 5-minute state: an UNLOGGED table skips WAL
+        # writes and fsync on every login/verify (rows are truncated after
+        # a crash, which only means users request a fresh code)
+        {"prefixes": ["UNLOGGED"]},
+    )
+    
     # Relationships
     user = relationship("User", foreign_keys=[user_id])
     
@@ -2,7 +2,6 @@
 Submission/Grading model with digital signature support.
 Faculty signs the assignment hash to verify grading authenticity.
 """
-import uuid
 from sqlalchemy import Column, Integer, ForeignKey, DateTime, Text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
@@ -27,7 +26,7 @@ class Submission(Base):
     """
     __tablename__ = "submissions"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=func.gen_random_uuid())
     
     # Assignment and faculty references
     assignment_id = Column(UUID(as_uuid=True), ForeignKey("assignments.id"), nullable=False, unique=True)
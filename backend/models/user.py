@@ -2,9 +2,9 @@
 User model with role-based access control.
 Stores RSA keys for encryption and digital signatures.
 """
-import uuid
-from sqlalchemy import Column, String, Enum, DateTime, Text, Boolean
+from sqlalchemy import Column, String, Enum, DateTime, Text, Boolean, CheckConstraint, Index
 from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import deferred
 from sqlalchemy.sql import func
 import enum
 from database import Base
@@ -22,24 +22,46 @@ class User(Base):
     User model with authentication and encryption key storage.
     
     Security features:
-    - Password stored as bcrypt hash (never plaintext)
+    - Password stored as argon2id hash (never plaintext)
     - RSA public key for encryption (all users)
     - RSA private key for signatures (faculty only)
     - TOTP secret for MFA (RFC 6238 compliant)
     """
     __tablename__ = "users"
+    __table_args__ = (
+        CheckConstraint("role IN ('student', 'faculty', 'admin')", name="ck_users_role"),
+        # Covering index for the login lookup (index-only scans by email)
+        Index(
+            "ix_users_email_covering",
+            "email",
+            postgresql_include=["id", "role", "name", "password_hash", "mfa_enabled"]
+        ),
+    )
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=func.gen_random_uuid())
     name = Column(String(255), nullable=False)
     email = Column(String(255), unique=True, nullable=False, index=True)
-    role = Column(Enum(UserRole), nullable=False, default=UserRole.STUDENT)
+    # Stored as plain VARCHAR (lowercase enum values) guarded by ck_users_role,
+    # rather than a native PostgreSQL ENUM type
+    role = Column(
+        Enum(
+            UserRole,
+            native_enum=False,
+            create_constraint=False,
+            length=16,
+            values_callable=lambda roles: [role.value for role in roles]
+        ),
+        nullable=False,
+        default=UserRole.STUDENT
+    )
     
-    # Security: Password hashed with bcrypt
+    # Security: Password hashed with argon2id
     password_hash = Column(String(255), nullable=False)
     
-    # Encryption: RSA keys stored in PEM format
-    public_key_pem = Column(Text, nullable=False)
-    private_key_pem = Column(Text, nullable=True)  # Only for faculty (for signing)
+    # Encryption: RSA keys stored in PEM format.
+    # Deferred: only loaded when accessed (or undefer()'d) - most queries never need them
+    public_key_pem = deferred(Column(Text, nullable=False))
+    private_key_pem = deferred(Column(Text, nullable=True))  # Only for faculty (for signing)
     
     # TOTP MFA: RFC 6238 compliant Time-based One-Time Password
     totp_secret = Column(String(32), nullable=True)  # Base32 encoded secret
@@ -2,41 +2,84 @@
 Admin routes: user management, course management, faculty assignment.
 Implements ACL for admin-only access.
 """
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy import select, insert, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import undefer
 from typing import List
 from database import get_db
 from models.user import User, UserRole
 from models.course import Course
+from schemas import USER_RESPONSE_ADAPTER, encode_response
 from schemas.user import UserCreate, UserResponse, UserUpdate
 from schemas.course import CourseCreate, CourseResponse, AssignFaculty
-from utils.acl import get_current_user, check_permission, require_permission, require_role, require_admin
+from utils.acl import get_current_user, check_permission, require_permission, require_role, require_admin, invalidate_cached_user
 from utils.auth import hash_password
-from utils.encryption import generate_rsa_keypair
+from utils.http_cache import etag_response
+from utils.keypair_pool import keypair_pool
+from utils.cpu_pool import cpu_pool
+import orjson
 import uuid
 
 router = APIRouter(prefix="/admin", tags=["Admin"])
 
+# List responses are our own query rows, so they skip Pydantic and are
+# encoded by orjson directly (UUIDs, enums and datetimes handled in C).
+# OPT_UTC_Z keeps the "...Z" timestamps Pydantic would have produced.
+_JSON_OPTIONS = orjson.OPT_UTC_Z
+
+# Rows fetched per server-side cursor round trip for the list endpoints
+_LIST_BATCH_SIZE = 500
+
+
+async def _encode_rows(result) -> bytes:
+    """
+    Encode a streamed result as a JSON array, one batch at a time.
+    
+    Only one batch of Row objects is alive at once; the rest of the list
+    exists only as encoded bytes. The full body is still assembled (rather
+    than streamed to the client) because the ETag must be known up front.
+    
+    Args:
+        result: AsyncResult from AsyncSession.stream() with yield_per
+        
+    Returns:
+        JSON array bytes
+    """
+    chunks = [
+        # Strip each batch's brackets so the batches join into one array
+        orjson.dumps([row._asdict() for row in batch], option=_JSON_OPTIONS)[1:-1]
+        async for batch in result.partitions()
+    ]
+    return b"[" + b",".join(chunks) + b"]"
+
 
 @router.get("/users", response_model=List[UserResponse])
-def list_users(
+async def list_users(
+    request: Request,
     current_user: User = Depends(require_admin),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     List all users in the system.
     
     ACL: Only admins can view all users
+    
+    Supports If-None-Match: an unchanged list is answered with 304.
     """
-    users = db.query(User).all()
-    return users
+    # Only the columns in UserResponse - skips ORM objects and the PEM key blobs
+    users = await db.stream(
+        select(User.id, User.name, User.email, User.role, User.created_at)
+        .execution_options(yield_per=_LIST_BATCH_SIZE)
+    )
+    return etag_response(request, await _encode_rows(users))
 
 
 @router.post("/users", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-def create_user(
+async def create_user(
     user_data: UserCreate,
     current_user: User = Depends(require_admin),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Create a new user (admin function).
@@ -45,61 +88,63 @@ def create_user(
     
     This allows admins to create faculty accounts directly.
     """
-    # Check if user already exists
-    existing_user = db.query(User).filter(User.email == user_data.email).first()
-    if existing_user:
+    # Check if user already exists (SELECT 1, answered from the email index)
+    email_taken = (await db.execute(
+        select(1).where(User.email == user_data.email).limit(1)
+    )).scalar() is not None
+    if email_taken:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
         )
     
-    # Hash password
-    password_hash = hash_password(user_data.password)
-    
-    # Generate RSA key pair
-    public_key_pem, private_key_pem = generate_rsa_keypair()
-    
-    # Create user
-    new_user = User(
-        name=user_data.name,
-        email=user_data.email,
-        role=user_data.role,
-        password_hash=password_hash,
-        public_key_pem=public_key_pem,
-        # Only faculty get private key for signing
-        private_key_pem=private_key_pem if user_data.role == UserRole.FACULTY else None
-    )
+    # Hash password (CPU-bound; runs in a crypto worker process)
+    password_hash = await cpu_pool.run(hash_password, user_data.password)
+    
+    # Take a pre-generated RSA key pair from the pool (generated in a crypto
+    # worker process if the pool is empty)
+    public_key_pem, private_key_pem = await keypair_pool.get()
     
-    db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    # Create user; RETURNING hands back the response fields without a reload
+    new_user = (await db.execute(
+        insert(User)
+        .values(
+            name=user_data.name,
+            email=user_data.email,
+            role=user_data.role,
+            password_hash=password_hash,
+            public_key_pem=public_key_pem,
+            # Only faculty get private key for signing
+            private_key_pem=private_key_pem if user_data.role == UserRole.FACULTY else None
+        )
+        .returning(User.id, User.name, User.email, User.role, User.created_at)
+    )).one()
+    await db.commit()
     
-    return new_user
+    return Response(
+        content=encode_response(USER_RESPONSE_ADAPTER, new_user),
+        status_code=status.HTTP_201_CREATED,
+        media_type="application/json"
+    )
 
 
 @router.put("/users/{user_id}/role", response_model=UserResponse)
-def update_user_role(
-    user_id: str,
+async def update_user_role(
+    user_id: uuid.UUID,
     update_data: UserUpdate,
     current_user: User = Depends(require_admin),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Update user information (primarily role).
     
     ACL: Only admins can update users
     """
-    # Parse user ID
-    try:
-        user_uuid = uuid.UUID(user_id)
-    except ValueError:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid user ID format"
-        )
-    
     # Get user
-    user = db.query(User).filter(User.id == user_uuid).first()
+    # private_key_pem is deferred and can't lazy-load under AsyncSession
+    user = (await db.execute(
+        select(User).options(undefer(User.private_key_pem)).where(User.id == user_id)
+    )).scalars().first()
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -116,52 +161,50 @@ def update_user_role(
         
         # If promoting to faculty, generate private key if not exists
         if update_data.role == UserRole.FACULTY and not user.private_key_pem:
-            _, private_key_pem = generate_rsa_keypair()
+            _, private_key_pem = await keypair_pool.get()
             user.private_key_pem = private_key_pem
         
         # If demoting from faculty, could remove private key (optional)
         # For safety, we'll keep it
     
-    db.commit()
-    db.refresh(user)
+    # No refresh needed: nothing here is server-generated and the session
+    # doesn't expire attributes on commit
+    await db.commit()
+    # Role changes must take effect on the user's next request
+    invalidate_cached_user(user.id)
     
-    return user
+    return Response(content=encode_response(USER_RESPONSE_ADAPTER, user), media_type="application/json")
 
 
 @router.get("/courses", response_model=List[CourseResponse])
-def list_courses(
+async def list_courses(
+    request: Request,
     current_user: User = Depends(require_admin),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     List all courses.
     
     ACL: Only admins can view all courses
-    """
-    courses = db.query(Course).all()
     
-    result = []
-    for course in courses:
-        faculty = None
-        if course.faculty_id:
-            faculty = db.query(User).filter(User.id == course.faculty_id).first()
-        
-        result.append(CourseResponse(
-            id=str(course.id),
-            name=course.name,
-            code=course.code,
-            faculty_id=str(course.faculty_id) if course.faculty_id else None,
-            faculty_name=faculty.name if faculty else None
-        ))
+    Supports If-None-Match: an unchanged list is answered with 304.
+    """
+    # One joined column query; no ORM objects are built
+    rows = await db.stream(
+        select(Course.id, Course.name, Course.code, Course.faculty_id, User.name.label("faculty_name"))
+        .outerjoin(User, User.id == Course.faculty_id)
+        .execution_options(yield_per=_LIST_BATCH_SIZE)
+    )
     
-    return result
+    # Row mappings already match CourseResponse (orjson writes UUIDs as strings)
+    return etag_response(request, await _encode_rows(rows))
 
 
 @router.post("/courses", response_model=CourseResponse, status_code=status.HTTP_201_CREATED)
-def create_course(
+async def create_course(
     course_data: CourseCreate,
     current_user: User = Depends(require_admin),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Create a new course.
@@ -169,22 +212,22 @@ def create_course(
     ACL: Only admins can create courses
     """
     # Check if course code already exists
-    existing_course = db.query(Course).filter(Course.code == course_data.code).first()
-    if existing_course:
+    code_taken = (await db.execute(
+        select(1).where(Course.code == course_data.code).limit(1)
+    )).scalar() is not None
+    if code_taken:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Course code already exists"
         )
     
-    # Create course
-    course = Course(
-        name=course_data.name,
-        code=course_data.code
-    )
-    
-    db.add(course)
-    db.commit()
-    db.refresh(course)
+    # Create course; RETURNING hands back the generated id without a reload
+    course = (await db.execute(
+        insert(Course)
+        .values(name=course_data.name, code=course_data.code)
+        .returning(Course.id, Course.name, Course.code)
+    )).one()
+    await db.commit()
     
     return CourseResponse(
         id=str(course.id),
@@ -196,57 +239,61 @@ def create_course(
 
 
 @router.post("/courses/assign-faculty")
-def assign_faculty_to_course(
+async def assign_faculty_to_course(
     assignment: AssignFaculty,
     current_user: User = Depends(require_admin),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Assign faculty to a course.
     
     ACL: Only admins can assign faculty
     """
-    # Parse IDs
-    try:
-        course_uuid = uuid.UUID(assignment.course_id)
-        faculty_uuid = uuid.UUID(assignment.faculty_id)
-    except ValueError:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid ID format"
+    # Course and faculty in one round trip; the outer join leaves the
+    # faculty columns NULL when no such user exists
+    row = (await db.execute(
+        select(
+            Course.name.label("course_name"),
+            User.id.label("faculty_id"),
+            User.name.label("faculty_name"),
+            User.role.label("faculty_role")
         )
+        .select_from(Course)
+        .outerjoin(User, User.id == assignment.faculty_id)
+        .where(Course.id == assignment.course_id)
+    )).one_or_none()
     
-    # Get course
-    course = db.query(Course).filter(Course.id == course_uuid).first()
-    if not course:
+    if row is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Course not found"
         )
     
-    # Get faculty
-    faculty = db.query(User).filter(User.id == faculty_uuid).first()
-    if not faculty:
+    if row.faculty_id is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Faculty not found"
         )
     
     # Verify user is faculty
-    if faculty.role != UserRole.FACULTY:
+    if row.faculty_role != UserRole.FACULTY:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="User is not a faculty member"
         )
     
-    # Assign faculty to course
-    course.faculty_id = faculty_uuid
-    db.commit()
+    # Assign faculty to course (single-column UPDATE, no ORM flush)
+    await db.execute(
+        update(Course)
+        .where(Course.id == assignment.course_id)
+        .values(faculty_id=assignment.faculty_id)
+    )
+    await db.commit()
     
     return {
         "message": "Faculty assigned successfully",
-        "course_id": str(course.id),
-        "course_name": course.name,
-        "faculty_id": str(faculty.id),
-        "faculty_name": faculty.name
+        "course_id": str(assignment.course_id),
+        "course_name": row.course_name,
+        "faculty_id": str(row.faculty_id),
+        "faculty_name": row.faculty_name
     }
@@ -2,33 +2,71 @@
 Authentication routes: registration, login, OTP verification, TOTP MFA enrollment, token refresh.
 Implements multi-factor authentication with email OTP and TOTP (RFC 6238).
 """
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select, insert, update, bindparam, func, text
+from sqlalchemy.ext.asyncio import AsyncSession
 from database import get_db
 from models.user import User, UserRole
 from models.otp import OTP
+from schemas import USER_RESPONSE_ADAPTER, MFA_STATUS_ADAPTER, encode_response
 from schemas.user import UserCreate, UserLogin, UserResponse
 from schemas.auth import (
     TokenResponse, OTPVerifyRequest, RefreshTokenRequest,
     TOTPEnrollRequest, TOTPEnrollResponse, TOTPVerifyRequest, MFAStatusResponse
 )
-from utils.auth import hash_password, verify_password, create_access_token, create_refresh_token, verify_token
-from utils.encryption import generate_rsa_keypair
-from utils.otp import generate_otp, send_otp_email, get_otp_expiry, is_otp_expired
+from utils.auth import hash_password, verify_password, password_needs_rehash, dummy_password_hash, create_access_token, create_refresh_token, verify_token
+from utils.keypair_pool import keypair_pool
+from utils.cpu_pool import cpu_pool
+from utils.otp import generate_otp, hash_otp, send_otp_email, get_otp_expiry
 from utils.totp import generate_totp_secret, get_totp_provisioning_uri, generate_qr_code, verify_totp_code
 from utils.rate_limiter import otp_rate_limiter
-from utils.acl import get_current_user
+from utils.acl import get_current_user, invalidate_cached_user
+from utils.http_cache import etag_response
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
+# Hot-path statements are built once at import; every request just binds
+# parameters and hits SQLAlchemy's compiled-statement cache
+_USER_BY_EMAIL = select(User).where(User.email == bindparam("email"))
+# Redeems the newest unused, unexpired OTP matching the code's digest for the
+# user with this email, in one statement (UPDATE ... FROM users). Expiry is
+# checked by the database, and the outer is_used guard makes it a
+# compare-and-set: two concurrent requests can't both consume it. Matching
+# on the keyed digest rather than the code keeps the comparison timing-safe
+# (see utils.otp.hash_otp). Built on the Core tables: ORM-enabled UPDATE
+# can't RETURN columns of the FROM table.
+_CONSUME_OTP = (
+    update(OTP.__table__)
+    .where(
+        OTP.id == (
+            select(OTP.id)
+            .join(User, User.id == OTP.user_id)
+            .where(
+                User.email == bindparam("b_email"),
+                OTP.otp_hash == bindparam("b_otp_hash"),
+                OTP.is_used == False,
+                OTP.expiry_timestamp > func.now()
+            )
+            .order_by(OTP.created_at.desc())
+            .limit(1)
+            .scalar_subquery()
+        ),
+        OTP.is_used == False,
+        User.id == OTP.user_id
+    )
+    .values(is_used=True)
+    .returning(OTP.user_id, User.role)
+)
+
 
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-def register(user_data: UserCreate, db: Session = Depends(get_db)):
+async def register(user_data: UserCreate, db: AsyncSession = Depends(get_db)):
     """
     Register a new user.
     
     Security features:
-    - Password hashed with bcrypt
+    - Password hashed with argon2id
     - RSA key pair generated for encryption
     - Faculty get private key for signing
     - Input validation via Pydantic
@@ -40,40 +78,48 @@ def register(user_data: UserCreate, db: Session = Depends(get_db)):
     4. Create user record
     5. Return user data (no password)
     """
-    # Check if user already exists
-    existing_user = db.query(User).filter(User.email == user_data.email).first()
-    if existing_user:
+    # Check if user already exists (SELECT 1, answered from the email index)
+    email_taken = (await db.execute(
+        select(1).where(User.email == user_data.email).limit(1)
+    )).scalar() is not None
+    if email_taken:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
         )
     
-    # Hash password
-    password_hash = hash_password(user_data.password)
-    
-    # Generate RSA key pair
-    public_key_pem, private_key_pem = generate_rsa_keypair()
-    
-    # Create user
-    new_user = User(
-        name=user_data.name,
-        email=user_data.email,
-        role=user_data.role,
-        password_hash=password_hash,
-        public_key_pem=public_key_pem,
-        # Only faculty get private key for signing
-        private_key_pem=private_key_pem if user_data.role == UserRole.FACULTY else None
+    # Hash password (CPU-bound; runs in a crypto worker process)
+    password_hash = await cpu_pool.run(hash_password, user_data.password)
+    
+    # Take a pre-generated RSA key pair from the pool (generated in a crypto
+    # worker process if the pool is empty)
+    public_key_pem, private_key_pem = await keypair_pool.get()
+    
+    # Create user; RETURNING hands back the response fields without a reload
+    new_user = (await db.execute(
+        insert(User)
+        .values(
+            name=user_data.name,
+            email=user_data.email,
+            role=user_data.role,
+            password_hash=password_hash,
+            public_key_pem=public_key_pem,
+            # Only faculty get private key for signing
+            private_key_pem=private_key_pem if user_data.role == UserRole.FACULTY else None
+        )
+        .returning(User.id, User.name, User.email, User.role, User.created_at)
+    )).one()
+    await db.commit()
+    
+    return Response(
+        content=encode_response(USER_RESPONSE_ADAPTER, new_user),
+        status_code=status.HTTP_201_CREATED,
+        media_type="application/json"
     )
-    
-    db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
-    
-    return new_user
 
 
 @router.post("/login", response_model=TokenResponse)
-def login(credentials: UserLogin, db: Session = Depends(get_db)):
+async def login(credentials: UserLogin, background_tasks: BackgroundTasks, db: AsyncSession = Depends(get_db)):
     """
     Login with email and password.
     
@@ -96,20 +142,24 @@ def login(credentials: UserLogin, db: Session = Depends(get_db)):
     - user_id: User ID for frontend tracking
     """
     # Find user
-    user = db.query(User).filter(User.email == credentials.email).first()
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid email or password"
-        )
+    user = (await db.execute(_USER_BY_EMAIL, {"email": credentials.email})).scalar_one_or_none()
     
-    # Verify password
-    if not verify_password(credentials.password, user.password_hash):
+    # Verify password (CPU-bound; runs in a crypto worker process). Unknown
+    # emails are checked against a dummy hash so they take as long as a
+    # wrong password (built on first use; argon2 releases the GIL).
+    password_hash = user.password_hash if user else await run_in_threadpool(dummy_password_hash)
+    if not await cpu_pool.run(verify_password, credentials.password, password_hash) or not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password"
         )
     
+    # Upgrade hashes made with older argon2 parameters while we have the password
+    if password_needs_rehash(user.password_hash):
+        new_hash = await cpu_pool.run(hash_password, credentials.password)
+        await db.execute(update(User).where(User.id == user.id).values(password_hash=new_hash))
+        await db.commit()
+    
     # Check if TOTP MFA is enabled
     if user.mfa_enabled:
         # MFA enabled: Require TOTP code for login
@@ -127,32 +177,36 @@ def login(credentials: UserLogin, db: Session = Depends(get_db)):
         otp_code = generate_otp()
         otp_expiry = get_otp_expiry()
         
-        # Save OTP to database
-        new_otp = OTP(
-            user_id=user.id,
-            otp_code=otp_code,
-            expiry_timestamp=otp_expiry,
-            is_used=False
+        user_id, user_email, user_role = user.id, user.email, user.role
+        
+        # Save OTP to database (plain INSERT, no ORM object to track)
+        await db.execute(
+            insert(OTP).values(
+                user_id=user_id,
+                otp_hash=hash_otp(otp_code),
+                expiry_timestamp=otp_expiry,
+                is_used=False
+            )
         )
-        db.add(new_otp)
-        db.commit()
+        await db.commit()
         
-        # Send OTP via email (simulated)
-        send_otp_email(user.email, otp_code, otp_expiry)
+        # Send OTP via email (simulated) after the response is sent, so
+        # mail delivery latency isn't added to the login request
+        background_tasks.add_task(send_otp_email, user_email, otp_code, otp_expiry)
         
         # Return response indicating OTP is required for MFA setup
         return TokenResponse(
             access_token="",
             refresh_token="",
-            user_id=str(user.id),
-            role=user.role.value,
+            user_id=str(user_id),
+            role=user_role.value,
             requires_otp=True,
             requires_totp=False
         )
 
 
 @router.post("/mfa/enroll", response_model=TOTPEnrollResponse)
-def mfa_enroll(enroll_data: TOTPEnrollRequest, db: Session = Depends(get_db)):
+async def mfa_enroll(enroll_data: TOTPEnrollRequest, db: AsyncSession = Depends(get_db)):
     """
     Initiate TOTP MFA enrollment (after successful password login).
     
@@ -173,9 +227,9 @@ def mfa_enroll(enroll_data: TOTPEnrollRequest, db: Session = Depends(get_db)):
         enroll_data: User email (already verified via OTP)
         
     Returns:
-        QR code (Base64 PNG) and backup secret for user to save
+        QR code (SVG data URL) and backup secret for user to save
     """
-    user = db.query(User).filter(User.email == enroll_data.email).first()
+    user = (await db.execute(_USER_BY_EMAIL, {"email": enroll_data.email})).scalar_one_or_none()
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -199,13 +253,20 @@ def mfa_enroll(enroll_data: TOTPEnrollRequest, db: Session = Depends(get_db)):
         issuer="SecureAssignmentSystem"
     )
     
-    # Generate QR code
-    qr_code_image = generate_qr_code(provisioning_uri)
-    
-    # Store secret temporarily in session (in production, use cache with expiry)
-    # For now, we temporarily store it in DB without enabling MFA until verified
-    user.totp_secret = totp_secret
-    db.commit()
+    # Generate QR code (Reed-Solomon encoding is CPU-bound)
+    qr_code_image = await run_in_threadpool(generate_qr_code, provisioning_uri)
+    
+    # Store the pending secret in DB without enabling MFA until verified.
+    # The DB (not a per-process cache) keeps it visible to every worker.
+    # It is disposable until /mfa/verify succeeds, so the commit doesn't wait
+    # for the WAL fsync; a crash only means the user re-scans a new QR code.
+    await db.execute(text("SET LOCAL synchronous_commit TO OFF"))
+    await db.execute(
+        update(User)
+        .where(User.id == user.id, User.mfa_enabled == False)
+        .values(totp_secret=totp_secret)
+    )
+    await db.commit()
     
     return TOTPEnrollResponse(
         qr_code=qr_code_image,
@@ -215,7 +276,7 @@ def mfa_enroll(enroll_data: TOTPEnrollRequest, db: Session = Depends(get_db)):
 
 
 @router.post("/mfa/verify", response_model=TokenResponse)
-def mfa_verify_totp(verify_data: TOTPVerifyRequest, db: Session = Depends(get_db)):
+async def mfa_verify_totp(verify_data: TOTPVerifyRequest, db: AsyncSession = Depends(get_db)):
     """
     Verify TOTP code for either enrollment confirmation or login.
     
@@ -247,7 +308,7 @@ def mfa_verify_totp(verify_data: TOTPVerifyRequest, db: Session = Depends(get_db
         )
     
     # Find user
-    user = db.query(User).filter(User.email == verify_data.email).first()
+    user = (await db.execute(_USER_BY_EMAIL, {"email": verify_data.email})).scalar_one_or_none()
     if not user or not user.totp_secret:
         # Record failed attempt
         otp_rate_limiter.record_failed_attempt(verify_data.email)
@@ -276,16 +337,20 @@ def mfa_verify_totp(verify_data: TOTPVerifyRequest, db: Session = Depends(get_db
     # Clear rate limiting on success
     otp_rate_limiter.record_successful_attempt(verify_data.email)
     
-    # Enable MFA if not already enabled (enrollment scenario)
+    user_id, user_email, user_role = user.id, user.email, user.role
+    
+    # Enable MFA if not already enabled (enrollment scenario);
+    # one narrow UPDATE instead of flushing the whole ORM object
     if not user.mfa_enabled:
-        user.mfa_enabled = True
-        db.commit()
+        await db.execute(update(User).where(User.id == user_id).values(mfa_enabled=True))
+        await db.commit()
+        invalidate_cached_user(user_id)
     
     # Create JWT tokens
     token_data = {
-        "user_id": str(user.id),
-        "email": user.email,
-        "role": user.role.value
+        "user_id": str(user_id),
+        "email": user_email,
+        "role": user_role.value
     }
     
     access_token = create_access_token(token_data)
@@ -294,15 +359,15 @@ def mfa_verify_totp(verify_data: TOTPVerifyRequest, db: Session = Depends(get_db
     return TokenResponse(
         access_token=access_token,
         refresh_token=refresh_token,
-        user_id=str(user.id),
-        role=user.role.value,
+        user_id=str(user_id),
+        role=user_role.value,
         requires_otp=False,
         requires_totp=False
     )
 
 
 @router.post("/verify-otp", response_model=TokenResponse)
-def verify_otp(otp_data: OTPVerifyRequest, db: Session = Depends(get_db)):
+async def verify_otp(otp_data: OTPVerifyRequest, db: AsyncSession = Depends(get_db)):
     """
     Verify email OTP and proceed with MFA enrollment.
     
@@ -323,52 +388,36 @@ def verify_otp(otp_data: OTPVerifyRequest, db: Session = Depends(get_db)):
     - requires_otp: False (OTP verification complete)
     - requires_totp: False (next step is enrollment, not login)
     """
-    # Find user
-    user = db.query(User).filter(User.email == otp_data.email).first()
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid email"
-        )
-    
-    # Find latest unused OTP for this user
-    otp_record = db.query(OTP).filter(
-        OTP.user_id == user.id,
-        OTP.otp_code == otp_data.otp_code,
-        OTP.is_used == False
-    ).order_by(OTP.created_at.desc()).first()
-    
-    if not otp_record:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid OTP code"
-        )
-    
-    # Check if OTP is expired
-    if is_otp_expired(otp_record.expiry_timestamp):
+    # Find the user and mark used their latest valid OTP (one round trip)
+    consumed = (await db.execute(
+        _CONSUME_OTP, {"b_email": otp_data.email, "b_otp_hash": hash_otp(otp_data.otp_code)}
+    )).first()
+    await db.commit()
+    
+    # Unknown emails, wrong, already used and expired codes all look the
+    # same to the caller
+    if consumed is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="OTP has expired"
+            detail="Invalid or expired OTP code"
         )
     
-    # Mark OTP as used
-    otp_record.is_used = True
-    db.commit()
+    user_id, user_role = consumed
     
     # Response indicates user should proceed to MFA enrollment
     # Frontend will call /mfa/enroll to start TOTP setup
     return TokenResponse(
         access_token="",  # Will be provided after TOTP verification
         refresh_token="",
-        user_id=str(user.id),
-        role=user.role.value,
+        user_id=str(user_id),
+        role=user_role.value,
         requires_otp=False,  # OTP verification complete
         requires_totp=False  # Next step: MFA enrollment (not login TOTP)
     )
 
 
 @router.post("/refresh", response_model=TokenResponse)
-def refresh_token(token_request: RefreshTokenRequest, db: Session = Depends(get_db)):
+async def refresh_token(token_request: RefreshTokenRequest, db: AsyncSession = Depends(get_db)):
     """
     Refresh access token using refresh token.
     
@@ -404,26 +453,29 @@ def refresh_token(token_request: RefreshTokenRequest, db: Session = Depends(get_
 
 
 @router.get("/me", response_model=UserResponse)
-def get_current_user_info(current_user: User = Depends(get_current_user)):
+async def get_current_user_info(request: Request, current_user: User = Depends(get_current_user)):
     """
     Get current authenticated user information.
     
     Requires: Valid JWT token in Authorization header
+    Supports If-None-Match: unchanged user data is answered with 304.
     """
-    return current_user
+    body = encode_response(USER_RESPONSE_ADAPTER, current_user)
+    return etag_response(request, body)
 
 @router.get("/mfa/status", response_model=MFAStatusResponse)
-def mfa_status(current_user: User = Depends(get_current_user)):
+async def mfa_status(request: Request, current_user: User = Depends(get_current_user)):
     """
     Get MFA enrollment status for current user.
     
     Returns whether TOTP MFA is currently enabled.
     Requires: Valid JWT token in Authorization header
+    Supports If-None-Match; clients may reuse the answer for 5 seconds.
     """
-    status = "enabled" if current_user.mfa_enabled else "not_enabled"
     message = "TOTP MFA is " + ("enabled" if current_user.mfa_enabled else "not yet set up")
     
-    return MFAStatusResponse(
+    body = MFA_STATUS_ADAPTER.dump_json(MFAStatusResponse(
         mfa_enabled=current_user.mfa_enabled,
         message=message
-    )
\ No newline at end of file
+    ))
+    return etag_response(request, body, cache_control="private, max-age=5")
\ No newline at end of file
@@ -3,30 +3,48 @@ Faculty routes: view submissions, download files, grade assignments.
 Implements ACL for faculty-only access and digital signatures.
 """
 from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.responses import StreamingResponse
-from sqlalchemy.orm import Session
+from fastapi.responses import Response, StreamingResponse
+from sqlalchemy import select, insert, bindparam, case
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
-from datetime import datetime
 from database import get_db
 from models.user import User, UserRole
 from models.assignment import Assignment
 from models.submission import Submission
 from models.course import Course
+from schemas import SUBMISSION_RESPONSE_ADAPTER, encode_response
 from schemas.assignment import AssignmentResponse
 from schemas.submission import GradeAssignment, SubmissionResponse
 from utils.acl import get_current_user, check_permission, require_permission, require_role, require_faculty
-from utils.encryption import decrypt_file_hybrid
+from utils.encryption import unwrap_aes_key, decrypted_size, decrypt_stream
 from utils.signature import sign_hash
+from utils.cpu_pool import cpu_pool
+import logging
+import orjson
 import uuid
-import io
 
 router = APIRouter(prefix="/faculty", tags=["Faculty"])
+logger = logging.getLogger(__name__)
+
+# List responses are our own query rows, so they skip Pydantic and are
+# encoded by orjson directly; OPT_UTC_Z keeps Pydantic's "...Z" timestamps
+_JSON_OPTIONS = orjson.OPT_UTC_Z
+
+# private_key_pem is deferred on User and can't lazy-load under AsyncSession,
+# so the routes that need it select it explicitly, as an extra column of
+# their main query (bind "caller_id" to the current user's id)
+_CALLER_PRIVATE_KEY = (
+    select(User.private_key_pem)
+    .where(User.id == bindparam("caller_id"))
+    .scalar_subquery()
+    .label("private_key_pem")
+)
 
 
 @router.get("/assignments/assigned", response_model=List[AssignmentResponse])
-def get_assigned_submissions(
+async def get_assigned_submissions(
     current_user: User = Depends(require_faculty),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Get all assignments for courses assigned to this faculty.
@@ -37,43 +55,48 @@ def get_assigned_submissions(
     - List of assignments from their assigned courses
     - Includes grading status
     """
-    # Get courses assigned to this faculty
-    courses = db.query(Course).filter(Course.faculty_id == current_user.id).all()
-    course_ids = [course.id for course in courses]
-    
-    if not course_ids:
-        return []
-    
-    # Get all assignments for these courses
-    assignments = db.query(Assignment).filter(
-        Assignment.course_id.in_(course_ids)
-    ).all()
-    
-    result = []
-    for assignment in assignments:
-        # Check if already graded
-        submission = db.query(Submission).filter(
-            Submission.assignment_id == assignment.id
-        ).first()
-        
-        result.append(AssignmentResponse(
-            id=str(assignment.id),
-            student_id=str(assignment.student_id),
-            course_id=str(assignment.course_id),
-            filename=assignment.filename,
-            file_hash_sha256=assignment.file_hash_sha256,
-            upload_timestamp=assignment.upload_timestamp,
-            is_graded=submission is not None
-        ))
+    # Assignments in this faculty's courses plus their grading status, in one
+    # query: the course join does the ownership filter and the submission
+    # outer join replaces a per-assignment lookup (assignment_id is unique)
+    rows = (await db.execute(
+        select(
+            Assignment.id,
+            Assignment.student_id,
+            Assignment.course_id,
+            Assignment.filename,
+            Assignment.file_hash_sha256,
+            Assignment.upload_timestamp,
+            Submission.id.label("submission_id")
+        )
+        .join(Course, Course.id == Assignment.course_id)
+        .outerjoin(Submission, Submission.assignment_id == Assignment.id)
+        .where(Course.faculty_id == current_user.id)
+    )).all()
     
-    return result
+    # Dicts encoded once by orjson instead of per-row AssignmentResponse
+    # models re-encoded by FastAPI; the keys match AssignmentResponse
+    return Response(
+        content=orjson.dumps([
+            {
+                "id": row.id,
+                "student_id": row.student_id,
+                "course_id": row.course_id,
+                "filename": row.filename,
+                "file_hash_sha256": row.file_hash_sha256,
+                "upload_timestamp": row.upload_timestamp,
+                "is_graded": row.submission_id is not None
+            }
+            for row in rows
+        ], option=_JSON_OPTIONS),
+        media_type="application/json"
+    )
 
 
 @router.get("/assignments/{assignment_id}/download")
 async def download_assignment(
-    assignment_id: str,
+    assignment_id: uuid.UUID,
     current_user: User = Depends(require_faculty),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Download and decrypt assignment file.
@@ -90,17 +113,26 @@ async def download_assignment(
     - Decrypted file as download
     """
     
-    # Parse assignment ID
-    try:
-        assignment_uuid = uuid.UUID(assignment_id)
-    except ValueError:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid assignment ID format"
+    # Assignment metadata, course ownership and the faculty's private key in
+    # one query. Only the columns the download needs are read (no ORM entity
+    # holding a copy of the blob), and the blob itself is only fetched when
+    # this faculty owns the course.
+    assignment = (await db.execute(
+        select(
+            Assignment.id,
+            Assignment.filename,
+            Assignment.file_hash_sha256,
+            Assignment.aes_key_encrypted,
+            Course.faculty_id,
+            case(
+                (Course.faculty_id == current_user.id, Assignment.encrypted_file_blob)
+            ).label("encrypted_file_blob"),
+            _CALLER_PRIVATE_KEY
         )
-    
-    # Get assignment
-    assignment = db.query(Assignment).filter(Assignment.id == assignment_uuid).first()
+        .join(Course, Course.id == Assignment.course_id)
+        .where(Assignment.id == assignment_id),
+        {"caller_id": current_user.id}
+    )).first()
     if not assignment:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -108,73 +140,60 @@ async def download_assignment(
         )
     
     # Verify faculty is assigned to this course
-    course = db.query(Course).filter(Course.id == assignment.course_id).first()
-    if not course or course.faculty_id != current_user.id:
+    if assignment.faculty_id != current_user.id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="You are not assigned to this course"
         )
     
     # Faculty must have private key for decryption
-    if not current_user.private_key_pem:
+    private_key_pem = assignment.private_key_pem
+    if not private_key_pem:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Faculty private key not found"
         )
     
-    # ===== SECURITY LOGGING =====
-    print("\n" + "="*70)
-    print("🔓 SECURITY: FILE DOWNLOAD - HYBRID DECRYPTION")
-    print("="*70)
-    print(f"📄 File: {assignment.filename}")
-    print(f"👨‍🏫 Faculty: {current_user.email}")
-    print(f"\n🔑 File Hash (SHA-256) - COMPLETE:")
-    print(f"{assignment.file_hash_sha256}")
-    print(f"\n📌 Faculty's RSA-2048 Private Key - COMPLETE:")
-    print(current_user.private_key_pem)
-    print(f"\n🔄 Starting Hybrid Decryption...")
-    print(f"   Step 1: Decrypt AES key using RSA-2048 private key")
-    print(f"   Step 2: Decrypt file using AES-256 key")
-    # ============================
+    # Security walkthrough (DEBUG only; the private key itself is never logged)
+    logger.debug(
+        "SECURITY: file download - hybrid decryption\n"
+        "  file=%s faculty=%s sha256=%s\n"
+        "  step 1: unwrap AES key with RSA-2048 private key; step 2: AES-256 decrypt",
+        assignment.filename, current_user.email, assignment.file_hash_sha256
+    )
     
-    # Decrypt file
+    # Unwrap the AES key up front (RSA work runs in a crypto worker process)
+    # and check the final block's padding, so a bad key or blob still fails
+    # with a 500 before any bytes are sent
     try:
-        decrypted_content = decrypt_file_hybrid(
-            assignment.encrypted_file_blob,
-            assignment.aes_key_encrypted,
-            current_user.private_key_pem
-        )
-        
-        # ===== SECURITY LOGGING =====
-        print(f"✅ Decryption Complete!")
-        print(f"   Original file size: {len(decrypted_content)} bytes")
-        print(f"   File integrity can be verified with hash")
-        print("="*70 + "\n")
-        # ============================
+        aes_key = await cpu_pool.run(unwrap_aes_key, assignment.aes_key_encrypted, private_key_pem)
+        file_size = decrypted_size(assignment.encrypted_file_blob, aes_key)
     except Exception as e:
-        print(f"❌ Decryption Failed: {str(e)}")
-        print("="*70 + "\n")
+        logger.warning("Decryption failed for assignment %s: %s", assignment.id, e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Decryption failed: {str(e)}"
         )
     
-    # Return file as download
+    # Stream the file as it is decrypted, one chunk at a time. The size is
+    # known up front, so the body is sent with Content-Length rather than
+    # chunked transfer encoding (and clients can show progress).
     return StreamingResponse(
-        io.BytesIO(decrypted_content),
+        decrypt_stream(assignment.encrypted_file_blob, aes_key),
         media_type="application/octet-stream",
         headers={
-            "Content-Disposition": f"attachment; filename={assignment.filename}"
+            "Content-Disposition": f"attachment; filename={assignment.filename}",
+            "Content-Length": str(file_size)
         }
     )
 
 
 @router.post("/assignments/{assignment_id}/grade", response_model=SubmissionResponse)
-def grade_assignment(
-    assignment_id: str,
+async def grade_assignment(
+    assignment_id: uuid.UUID,
     grading: GradeAssignment,
     current_user: User = Depends(require_faculty),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Grade assignment and create digital signature.
@@ -197,17 +216,23 @@ def grade_assignment(
     - Submission record with signature
     """
     
-    # Parse assignment ID
-    try:
-        assignment_uuid = uuid.UUID(assignment_id)
-    except ValueError:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid assignment ID format"
+    # Assignment, course ownership, existing grade and the faculty's private
+    # key in one query (assignment_id is unique on submissions, so the outer
+    # join yields at most one row)
+    assignment = (await db.execute(
+        select(
+            Assignment.id,
+            Assignment.filename,
+            Assignment.file_hash_sha256,
+            Course.faculty_id,
+            Submission.id.label("submission_id"),
+            _CALLER_PRIVATE_KEY
         )
-    
-    # Get assignment
-    assignment = db.query(Assignment).filter(Assignment.id == assignment_uuid).first()
+        .join(Course, Course.id == Assignment.course_id)
+        .outerjoin(Submission, Submission.assignment_id == Assignment.id)
+        .where(Assignment.id == assignment_id),
+        {"caller_id": current_user.id}
+    )).first()
     if not assignment:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -215,84 +240,70 @@ def grade_assignment(
         )
     
     # Verify faculty is assigned to this course
-    course = db.query(Course).filter(Course.id == assignment.course_id).first()
-    if not course or course.faculty_id != current_user.id:
+    if assignment.faculty_id != current_user.id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="You are not assigned to this course"
         )
     
     # Check if already graded
-    existing_submission = db.query(Submission).filter(
-        Submission.assignment_id == assignment_uuid
-    ).first()
-    if existing_submission:
+    if assignment.submission_id is not None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Assignment already graded"
         )
     
     # Faculty must have private key for signing
-    if not current_user.private_key_pem:
+    private_key_pem = assignment.private_key_pem
+    if not private_key_pem:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Faculty private key not found"
         )
     
-    # ===== SECURITY LOGGING =====
-    print("\n" + "="*70)
-    print("✍️  SECURITY: GRADING - DIGITAL SIGNATURE GENERATION")
-    print("="*70)
-    print(f"📄 Assignment: {assignment.filename}")
-    print(f"👨‍🏫 Faculty: {current_user.email}")
-    print(f"📊 Marks: {grading.marks}/100")
-    print(f"💬 Feedback: {grading.feedback or '(none)'}")
-    print(f"\n🔑 File Hash to Sign (SHA-256) - COMPLETE:")
-    print(f"{assignment.file_hash_sha256}")
-    print(f"\n📌 Faculty's RSA-2048 Private Key - COMPLETE:")
-    print(current_user.private_key_pem)
-    print(f"\n🔄 Generating Digital Signature...")
-    print(f"   Algorithm: RSA-2048 signing with PKCS1v15 padding")
-    print(f"   Signing the SHA-256 hash with faculty's private key")
-    # ============================
+    # Security walkthrough (DEBUG only; the private key itself is never logged)
+    logger.debug(
+        "SECURITY: grading - digital signature generation\n"
+        "  assignment=%s faculty=%s marks=%s/100 feedback=%s\n"
+        "  signing sha256=%s with RSA-2048 PSS (SHA-256, MGF1)",
+        assignment.filename, current_user.email, grading.marks, grading.feedback or "(none)",
+        assignment.file_hash_sha256
+    )
     
     # Sign file hash
     try:
-        signature = sign_hash(assignment.file_hash_sha256, current_user.private_key_pem)
-        
-        # ===== SECURITY LOGGING =====
-        print(f"\n✅ Digital Signature Generated Successfully!")
-        print(f"\n📝 Complete Digital Signature (Base64):")
-        print(signature)
-        print(f"\n📏 Signature Details:")
-        print(f"   - Length: {len(signature)} characters (Base64 encoded)")
-        print(f"   - Algorithm: RSA-2048 with PKCS1v15")
-        print(f"\n🔐 Security Benefits:")
-        print(f"   ✓ Authenticity: Proves {current_user.email} graded this assignment")
-        print(f"   ✓ Integrity: Any tampering with marks/feedback will be detected")
-        print(f"   ✓ Non-repudiation: Faculty cannot deny grading this assignment")
-        print(f"   ✓ Timestamp: Grade recorded at {datetime.utcnow()}")
-        print("="*70 + "\n")
-        # ============================
+        # RSA signing is CPU-bound; runs in a crypto worker process
+        signature = await cpu_pool.run(sign_hash, assignment.file_hash_sha256, private_key_pem)
     except Exception as e:
-        print(f"\n❌ Signature Generation Failed: {str(e)}")
-        print("="*70 + "\n")
+        logger.warning("Signature generation failed for assignment %s: %s", assignment.id, e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Signature generation failed: {str(e)}"
         )
     
-    # Create submission record
-    submission = Submission(
-        assignment_id=assignment_uuid,
-        faculty_id=current_user.id,
-        faculty_signature=signature,
-        marks=grading.marks,
-        feedback=grading.feedback
-    )
+    logger.debug("SECURITY: signature generated (%d base64 chars): %s", len(signature), signature)
     
-    db.add(submission)
-    db.commit()
-    db.refresh(submission)
+    # Create submission record; RETURNING hands back the response fields
+    # without a reload
+    submission = (await db.execute(
+        insert(Submission)
+        .values(
+            assignment_id=assignment_id,
+            faculty_id=current_user.id,
+            faculty_signature=signature,
+            marks=grading.marks,
+            feedback=grading.feedback
+        )
+        .returning(
+            Submission.id,
+            Submission.assignment_id,
+            Submission.faculty_id,
+            Submission.faculty_signature,
+            Submission.marks,
+            Submission.feedback,
+            Submission.graded_timestamp
+        )
+    )).one()
+    await db.commit()
     
-    return submission
+    return Response(content=encode_response(SUBMISSION_RESPONSE_ADAPTER, submission), media_type="application/json")
@@ -2,28 +2,82 @@
 Student routes: upload assignment, view submissions, view marks.
 Implements ACL for student-only access.
 """
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Request, status, UploadFile, File, Form
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse, Response
+from fastapi.routing import APIRoute
+from sqlalchemy import select, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import undefer
+from typing import Any, Callable, Coroutine, Dict, List
 from database import get_db
 from models.user import User, UserRole
 from models.assignment import Assignment
 from models.submission import Submission
 from models.course import Course
+from schemas import ASSIGNMENT_RESPONSE_ADAPTER
 from schemas.assignment import AssignmentResponse, MySubmissionsResponse
 from schemas.course import CourseResponse
-from utils.acl import get_current_user, check_permission, require_permission, require_role, require_student
-from utils.encryption import encrypt_file_hybrid
-from utils.signature import generate_file_hash
+from utils.acl import get_current_payload, check_permission, require_permission, require_role, require_student
+from utils.encryption import encrypt_and_hash
+from utils.cpu_pool import cpu_pool
+from config import settings
+import logging
+import orjson
 import uuid
 
-router = APIRouter(prefix="/student", tags=["Student"])
+logger = logging.getLogger(__name__)
+
+# List responses are our own query rows, so they skip Pydantic and are
+# encoded by orjson directly; OPT_UTC_Z keeps Pydantic's "...Z" timestamps
+_JSON_OPTIONS = orjson.OPT_UTC_Z
+
+# Uploads are read in chunks of this size
+_UPLOAD_READ_CHUNK = 1 << 20
+# Allowance for multipart boundaries, headers and the other form fields when
+# comparing Content-Length against the file size limit
+_MULTIPART_OVERHEAD = 64 * 1024
+
+
+def _upload_too_large() -> HTTPException:
+    """413 for an upload over MAX_UPLOAD_SIZE_MB."""
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"File exceeds the {settings.MAX_UPLOAD_SIZE_MB} MB upload limit"
+    )
+
+
+class _UploadSizeLimitRoute(APIRoute):
+    """
+    Route that checks Content-Length before FastAPI reads the request body.
+    
+    FastAPI parses (and Starlette spools) the whole multipart form before any
+    dependency or endpoint code runs, so an oversized upload has to be
+    refused here to avoid receiving it. Bodies without a Content-Length
+    (chunked) are still checked against the file size in the endpoint.
+    """
+    
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        """Wrap FastAPI's handler with the Content-Length check."""
+        handler = super().get_route_handler()
+        
+        async def size_limited_handler(request: Request) -> Response:
+            content_length = request.headers.get("content-length", "")
+            if content_length.isdigit() and int(content_length) > settings.max_upload_bytes + _MULTIPART_OVERHEAD:
+                raise _upload_too_large()
+            return await handler(request)
+        
+        return size_limited_handler
+
+
+# No student request body is larger than an upload, so the limit applies router-wide
+router = APIRouter(prefix="/student", tags=["Student"], route_class=_UploadSizeLimitRoute)
 
 
 @router.get("/courses", response_model=List[CourseResponse])
-def list_available_courses(
+async def list_available_courses(
     current_user: User = Depends(require_student),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Get all available courses for students.
@@ -33,32 +87,37 @@ def list_available_courses(
     Returns:
     - List of all courses with faculty assignments
     """
-    courses = db.query(Course).all()
-    
-    result = []
-    for course in courses:
-        faculty = None
-        if course.faculty_id:
-            faculty = db.query(User).filter(User.id == course.faculty_id).first()
-        
-        result.append(CourseResponse(
-            id=str(course.id),
-            name=course.name,
-            code=course.code,
-            faculty_id=str(course.faculty_id) if course.faculty_id else None,
-            faculty_name=faculty.name if faculty else None
-        ))
-    
-    return result
+    courses = (await db.execute(select(Course))).scalars().all()
+    
+    # Fetch every assigned faculty's name in one query instead of one per course
+    faculty_ids = {course.faculty_id for course in courses if course.faculty_id}
+    faculty_names = {}
+    if faculty_ids:
+        faculty_names = dict((await db.execute(
+            select(User.id, User.name).where(User.id.in_(faculty_ids))
+        )).all())
+    
+    # Plain dicts straight to orjson; the values come from our own rows, so
+    # re-validating them through CourseResponse would be wasted work
+    return ORJSONResponse([
+        {
+            "id": course.id,
+            "name": course.name,
+            "code": course.code,
+            "faculty_id": course.faculty_id,
+            "faculty_name": faculty_names.get(course.faculty_id)
+        }
+        for course in courses
+    ])
 
 
 
 @router.post("/assignments/upload", response_model=AssignmentResponse, status_code=status.HTTP_201_CREATED)
 async def upload_assignment(
-    course_id: str = Form(...),
+    course_id: uuid.UUID = Form(...),
     file: UploadFile = File(...),
     current_user: User = Depends(require_student),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Student uploads assignment file.
@@ -76,18 +135,19 @@ async def upload_assignment(
     - Student selects course and uploads file
     - File encrypted before storage
     - Faculty can decrypt with their private key
+    
+    Files larger than MAX_UPLOAD_SIZE_MB are rejected with 413.
     """
     
-    # Validate course exists
-    try:
-        course_uuid = uuid.UUID(course_id)
-    except ValueError:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid course ID format"
-        )
+    # Content-Length was already checked by the route class before the body
+    # was read; a chunked body is only sized once spooled, so check the file
+    # itself before touching the database (and again while reading it)
+    max_bytes = settings.max_upload_bytes
+    if file.size is not None and file.size > max_bytes:
+        raise _upload_too_large()
     
-    course = db.query(Course).filter(Course.id == course_uuid).first()
+    # Validate course exists
+    course = (await db.execute(select(Course).where(Course.id == course_id))).scalars().first()
     if not course:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -101,88 +161,90 @@ async def upload_assignment(
         )
     
     # Get faculty's public key for encryption
-    faculty = db.query(User).filter(User.id == course.faculty_id).first()
+    faculty = (await db.execute(
+        select(User).options(undefer(User.public_key_pem)).where(User.id == course.faculty_id)
+    )).scalars().first()
     if not faculty:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Faculty not found"
         )
     
-    # Read file content
-    file_content = await file.read()
+    # Read file content in bounded chunks, never past the size limit
+    file_content = bytearray()
+    while chunk := await file.read(_UPLOAD_READ_CHUNK):
+        if len(file_content) + len(chunk) > max_bytes:
+            raise _upload_too_large()
+        file_content += chunk
     if len(file_content) == 0:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="File is empty"
         )
     
-    # Generate file hash for integrity
-    file_hash = generate_file_hash(file_content)
-    
-    # ===== SECURITY LOGGING =====
-    print("\n" + "="*70)
-    print("🔐 SECURITY: ASSIGNMENT UPLOAD - HYBRID ENCRYPTION")
-    print("="*70)
-    print(f"📄 File: {file.filename}")
-    print(f"📏 Size: {len(file_content)} bytes")
-    print(f"\n🔑 File Hash (SHA-256) - COMPLETE:")
-    print(f"{file_hash}")
-    print(f"\n👤 Student: {current_user.email}")
-    print(f"👨‍🏫 Faculty to encrypt for: {faculty.email}")
-    print(f"\n📌 Faculty's RSA-2048 Public Key - COMPLETE:")
-    print(faculty.public_key_pem)
-    print(f"\n🔄 Starting Hybrid Encryption (RSA + AES)...")
-    # ============================
-    
-    # Encrypt file with faculty's public key
-    encrypted_file, encrypted_aes_key = encrypt_file_hybrid(file_content, faculty.public_key_pem)
-    
-    # ===== SECURITY LOGGING =====
-    print(f"\n✅ Hybrid Encryption Complete!")
-    print(f"   - AES-256 key: Generated (32 bytes random)")
-    print(f"   - Encrypted file size: {len(encrypted_file)} bytes")
-    print(f"   - Encrypted AES key (Base64): {encrypted_aes_key[:100]}...")
-    print(f"   - Full encrypted AES key length: {len(encrypted_aes_key)} characters")
-    print(f"\n🔒 File Security:")
-    print(f"   ✓ File encrypted with AES-256 (symmetric)")
-    print(f"   ✓ AES key encrypted with faculty's RSA-2048 public key")
-    print(f"   ✓ File integrity protected with SHA-256 hash")
-    print(f"   ✓ Only {faculty.email} can decrypt with their private key")
-    print("="*70 + "\n")
-    # ============================
-    
-    # Create assignment record
-    assignment = Assignment(
-        student_id=current_user.id,
-        course_id=course_uuid,
-        filename=file.filename,
-        encrypted_file_blob=encrypted_file,
-        file_hash_sha256=file_hash,
-        aes_key_encrypted=encrypted_aes_key
+    # Security walkthrough (DEBUG only; args are formatted lazily)
+    logger.debug(
+        "SECURITY: assignment upload - hybrid encryption\n"
+        "  file=%s size=%d bytes\n"
+        "  student=%s encrypting for faculty=%s\n"
+        "  faculty RSA-2048 public key:\n%s",
+        file.filename, len(file_content),
+        current_user.email, faculty.email, faculty.public_key_pem
     )
     
-    db.add(assignment)
-    db.commit()
-    db.refresh(assignment)
+    # Hash for integrity and encrypt with faculty's public key in one pass
+    # over the file. This runs in the threadpool, not a crypto worker process:
+    # OpenSSL's AES and SHA-256 release the GIL, and a worker would pickle the
+    # whole file there and the whole ciphertext back. The RSA step is only a
+    # public-key wrap of 32 bytes.
+    encrypted_file, file_hash, encrypted_aes_key = await run_in_threadpool(
+        encrypt_and_hash, file_content, faculty.public_key_pem
+    )
+    
+    logger.debug(
+        "SECURITY: hybrid encryption complete - sha256=%s, AES-256 encrypted file %d bytes, "
+        "RSA-wrapped AES key %d chars; only %s can decrypt",
+        file_hash, len(encrypted_file), len(encrypted_aes_key), faculty.email
+    )
+    
+    # Create assignment record; RETURNING hands back the generated id and
+    # timestamp without a reload (which would also re-read the blob)
+    assignment = (await db.execute(
+        insert(Assignment)
+        .values(
+            student_id=current_user.id,
+            course_id=course_id,
+            filename=file.filename,
+            encrypted_file_blob=encrypted_file,
+            file_hash_sha256=file_hash,
+            aes_key_encrypted=encrypted_aes_key
+        )
+        .returning(Assignment.id, Assignment.upload_timestamp)
+    )).one()
+    await db.commit()
     
     # Return response
     response = AssignmentResponse(
         id=str(assignment.id),
-        student_id=str(assignment.student_id),
-        course_id=str(assignment.course_id),
-        filename=assignment.filename,
-        file_hash_sha256=assignment.file_hash_sha256,
+        student_id=str(current_user.id),
+        course_id=str(course_id),
+        filename=file.filename,
+        file_hash_sha256=file_hash,
         upload_timestamp=assignment.upload_timestamp,
         is_graded=False
     )
     
-    return response
+    return Response(
+        content=ASSIGNMENT_RESPONSE_ADAPTER.dump_json(response),
+        status_code=status.HTTP_201_CREATED,
+        media_type="application/json"
+    )
 
 
 @router.get("/assignments/my-submissions", response_model=List[MySubmissionsResponse])
-def get_my_submissions(
+async def get_my_submissions(
     current_user: User = Depends(require_student),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Get all submissions by current student.
@@ -193,53 +255,52 @@ def get_my_submissions(
     - List of assignments with grading status
     - If graded, includes marks, feedback, and signature
     """
-    # Get all assignments by this student
-    assignments = db.query(Assignment).filter(
-        Assignment.student_id == current_user.id
-    ).all()
-    
+    # One query for every submission and its course, grade and grader,
+    # instead of three lookups per assignment (assignment_id is unique in
+    # submissions, so the outer joins never duplicate rows)
+    rows = (await db.execute(
+        select(
+            Assignment.id,
+            Assignment.filename,
+            Assignment.upload_timestamp,
+            Course.name.label("course_name"),
+            Submission.id.label("submission_id"),
+            Submission.marks,
+            Submission.feedback,
+            Submission.faculty_signature,
+            User.name.label("faculty_name")
+        )
+        .outerjoin(Course, Course.id == Assignment.course_id)
+        .outerjoin(Submission, Submission.assignment_id == Assignment.id)
+        .outerjoin(User, User.id == Submission.faculty_id)
+        .where(Assignment.student_id == current_user.id)
+    )).all()
+    
+    # Dicts encoded once by orjson instead of per-row MySubmissionsResponse
+    # models re-encoded by FastAPI; the keys match MySubmissionsResponse
     result = []
-    for assignment in assignments:
-        # Get course info
-        course = db.query(Course).filter(Course.id == assignment.course_id).first()
-        
-        # Check if graded
-        submission = db.query(Submission).filter(
-            Submission.assignment_id == assignment.id
-        ).first()
-        
-        if submission:
-            # Get faculty info
-            faculty = db.query(User).filter(User.id == submission.faculty_id).first()
-            
-            result.append(MySubmissionsResponse(
-                id=str(assignment.id),
-                filename=assignment.filename,
-                course_name=course.name if course else "Unknown",
-                upload_timestamp=assignment.upload_timestamp,
-                is_graded=True,
-                marks=submission.marks,
-                feedback=submission.feedback,
-                faculty_name=faculty.name if faculty else "Unknown",
-                faculty_signature=submission.faculty_signature
-            ))
-        else:
-            result.append(MySubmissionsResponse(
-                id=str(assignment.id),
-                filename=assignment.filename,
-                course_name=course.name if course else "Unknown",
-                upload_timestamp=assignment.upload_timestamp,
-                is_graded=False
-            ))
-    
-    return result
+    for row in rows:
+        graded = row.submission_id is not None
+        result.append({
+            "id": row.id,
+            "filename": row.filename,
+            "course_name": row.course_name or "Unknown",
+            "upload_timestamp": row.upload_timestamp,
+            "is_graded": graded,
+            "marks": row.marks,
+            "feedback": row.feedback,
+            "faculty_name": (row.faculty_name or "Unknown") if graded else None,
+            "faculty_signature": row.faculty_signature
+        })
+    
+    return Response(content=orjson.dumps(result, option=_JSON_OPTIONS), media_type="application/json")
 
 
 @router.get("/assignments/{assignment_id}/verify-signature")
-def verify_assignment_signature(
-    assignment_id: str,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+async def verify_assignment_signature(
+    assignment_id: uuid.UUID,
+    payload: Dict[str, Any] = Depends(get_current_payload),
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Verify faculty's digital signature on graded assignment.
@@ -255,87 +316,74 @@ def verify_assignment_signature(
     """
     from utils.signature import verify_signature
     
-    # Parse assignment ID
-    try:
-        assignment_uuid = uuid.UUID(assignment_id)
-    except ValueError:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid assignment ID format"
+    # Assignment, its grade and the grading faculty's public key in one
+    # query; the outer joins keep the "not graded yet" case distinguishable
+    # (assignment_id is unique on submissions, so at most one row)
+    row = (await db.execute(
+        select(
+            Assignment.student_id,
+            Assignment.filename,
+            Assignment.file_hash_sha256,
+            Submission.id.label("submission_id"),
+            Submission.faculty_signature,
+            User.id.label("faculty_id"),
+            User.name.label("faculty_name"),
+            User.email.label("faculty_email"),
+            User.public_key_pem
         )
-    
-    # Get assignment
-    assignment = db.query(Assignment).filter(Assignment.id == assignment_uuid).first()
-    if not assignment:
+        .outerjoin(Submission, Submission.assignment_id == Assignment.id)
+        .outerjoin(User, User.id == Submission.faculty_id)
+        .where(Assignment.id == assignment_id)
+    )).first()
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Assignment not found"
         )
     
-    # Check ownership
-    if assignment.student_id != current_user.id:
+    # Check ownership (only the caller's id is needed, straight from the token)
+    if str(row.student_id) != payload["user_id"]:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Access denied"
         )
     
-    # Get submission
-    submission = db.query(Submission).filter(Submission.assignment_id == assignment_uuid).first()
-    if not submission:
+    if row.submission_id is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Assignment not graded yet"
         )
     
-    # Get faculty
-    faculty = db.query(User).filter(User.id == submission.faculty_id).first()
-    if not faculty:
+    if row.faculty_id is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Faculty not found"
         )
     
-    # ===== SECURITY LOGGING =====
-    print("\n" + "="*70)
-    print("🔍 SECURITY: SIGNATURE VERIFICATION")
-    print("="*70)
-    print(f"📄 Assignment: {assignment.filename}")
-    print(f"👨‍🏫 Faculty who graded: {faculty.email}")
-    print(f"\n🔑 File Hash (SHA-256) - COMPLETE:")
-    print(f"{assignment.file_hash_sha256}")
-    print(f"\n✍️  Digital Signature (Base64) - COMPLETE:")
-    print(submission.faculty_signature)
-    print(f"\n📌 Faculty's RSA-2048 Public Key - COMPLETE:")
-    print(faculty.public_key_pem)
-    print(f"\n🔄 Verifying Signature...")
-    print(f"   Algorithm: RSA-2048 verification with PKCS1v15")
-    print(f"   Using faculty's public key to verify the signature")
-    # ============================
-    
-    # Verify signature
-    is_valid = verify_signature(
-        assignment.file_hash_sha256,
-        submission.faculty_signature,
-        faculty.public_key_pem
+    logger.debug(
+        "SECURITY: signature verification\n"
+        "  assignment=%s graded by faculty=%s sha256=%s\n"
+        "  signature (base64): %s\n"
+        "  faculty RSA-2048 public key:\n%s",
+        row.filename, row.faculty_email, row.file_hash_sha256,
+        row.faculty_signature, row.public_key_pem
+    )
+    
+    # Verify signature (RSA public-key operation; runs in a crypto worker process)
+    is_valid = await cpu_pool.run(
+        verify_signature,
+        row.file_hash_sha256,
+        row.faculty_signature,
+        row.public_key_pem
     )
     
-    # ===== SECURITY LOGGING =====
     if is_valid:
-        print(f"\n✅ SIGNATURE VERIFICATION: VALID ✓")
-        print(f"   ✓ Confirmed: {faculty.email} graded this assignment")
-        print(f"   ✓ Grade and feedback have NOT been tampered with")
-        print(f"   ✓ Faculty cannot deny grading (non-repudiation guaranteed)")
-        print(f"   ✓ Cryptographic proof: RSA-2048 signature verified")
+        logger.debug("SECURITY: signature VALID - %s graded this assignment; grade not tampered with", row.faculty_email)
     else:
-        print(f"\n❌ SIGNATURE VERIFICATION: INVALID ✗")
-        print(f"   ✗ Signature verification failed")
-        print(f"   ✗ Possible tampering detected or wrong key used")
-        print(f"   ✗ Grade authenticity cannot be confirmed")
-    print("="*70 + "\n")
-    # ============================
+        logger.warning("Signature verification failed for assignment %s (faculty %s)", assignment_id, row.faculty_email)
     
     return {
         "is_valid": is_valid,
-        "faculty_name": faculty.name,
-        "file_hash": assignment.file_hash_sha256
+        "faculty_name": row.faculty_name,
+        "file_hash": row.file_hash_sha256
     }
@@ -2,9 +2,37 @@
 Pydantic schemas package.
 """
 from .user import UserCreate, UserResponse, UserLogin
-from .auth import TokenResponse, OTPVerifyRequest, RefreshTokenRequest
+from .auth import (
+    TokenResponse, OTPVerifyRequest, RefreshTokenRequest,
+    TOTPEnrollRequest, TOTPEnrollResponse, TOTPVerifyRequest, MFAStatusResponse
+)
 from .assignment import AssignmentUpload, AssignmentResponse, MySubmissionsResponse
 from .submission import GradeAssignment, SubmissionResponse
+from pydantic import TypeAdapter
+from typing import Any
+
+# Response adapters built once at import and shared by the routers, which
+# return encoded bytes directly instead of going through FastAPI's
+# response_model pass (validate -> dict -> JSON) on every request
+USER_RESPONSE_ADAPTER = TypeAdapter(UserResponse)
+ASSIGNMENT_RESPONSE_ADAPTER = TypeAdapter(AssignmentResponse)
+SUBMISSION_RESPONSE_ADAPTER = TypeAdapter(SubmissionResponse)
+MFA_STATUS_ADAPTER = TypeAdapter(MFAStatusResponse)
+
+
+def encode_response(adapter: TypeAdapter, obj: Any) -> bytes:
+    """
+    Validate an ORM object/row (or model) and serialize it straight to JSON bytes.
+    
+    Args:
+        adapter: One of the module-level response adapters
+        obj: Model instance, ORM object or result row
+        
+    Returns:
+        JSON bytes
+    """
+    return adapter.dump_json(adapter.validate_python(obj, from_attributes=True))
+
 
 __all__ = [
     "UserCreate",
@@ -13,9 +41,18 @@ __all__ = [
     "TokenResponse",
     "OTPVerifyRequest",
     "RefreshTokenRequest",
+    "TOTPEnrollRequest",
+    "TOTPEnrollResponse",
+    "TOTPVerifyRequest",
+    "MFAStatusResponse",
     "AssignmentUpload",
     "AssignmentResponse",
     "MySubmissionsResponse",
     "GradeAssignment",
     "SubmissionResponse",
+    "USER_RESPONSE_ADAPTER",
+    "ASSIGNMENT_RESPONSE_ADAPTER",
+    "SUBMISSION_RESPONSE_ADAPTER",
+    "MFA_STATUS_ADAPTER",
+    "encode_response",
 ]
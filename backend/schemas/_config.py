@@ -0,0 +1,12 @@
+"""
+Shared model configs for the schemas package.
+"""
+from pydantic import ConfigDict
+
+# Core validators/serializers are built on first use instead of at import, so
+# processes only pay for the schemas they touch. Routers build the ones they
+# serve when FastAPI registers the routes (and schemas' response adapters).
+DEFERRED = ConfigDict(defer_build=True)
+
+# Response schemas read straight off ORM objects and result rows
+FROM_ATTRIBUTES = ConfigDict(from_attributes=True, defer_build=True)
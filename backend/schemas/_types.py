@@ -0,0 +1,11 @@
+"""
+Shared field types for the schemas package.
+"""
+from typing import Annotated
+from pydantic import Field
+
+# Email addresses: one compiled pattern shared by every schema that takes an
+# email, instead of EmailStr's per-request email-validator run. This is a
+# shape check only (something@domain.tld); whether the address exists is
+# proven by the OTP mail sent to it. Stays a plain str for the routes.
+Email = Annotated[str, Field(pattern=r"^[^@\s]+@[^@\s]+\.[^@\s]+$", max_length=254)]
@@ -4,10 +4,13 @@ Assignment-related Pydantic schemas.
 from pydantic import BaseModel, Field
 from typing import Optional
 from datetime import datetime
+from ._config import DEFERRED, FROM_ATTRIBUTES
 
 
 class AssignmentUpload(BaseModel):
     """Schema for assignment upload (metadata only, file in form-data)."""
+    model_config = DEFERRED
+    
     course_id: str
 
 
@@ -21,12 +24,13 @@ class AssignmentResponse(BaseModel):
     upload_timestamp: datetime
     is_graded: bool = False
     
-    class Config:
-        from_attributes = True
+    model_config = FROM_ATTRIBUTES
 
 
 class MySubmissionsResponse(BaseModel):
     """Schema for student's submission with grading info."""
+    model_config = DEFERRED
+    
     id: str
     filename: str
     course_name: str
@@ -1,12 +1,16 @@
 """
 Authentication-related Pydantic schemas.
 """
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel
 from typing import Optional
+from ._config import DEFERRED
+from ._types import Email
 
 
 class TokenResponse(BaseModel):
     """Schema for JWT token response."""
+    model_config = DEFERRED
+    
     access_token: str
     refresh_token: str
     token_type: str = "bearer"
@@ -18,34 +22,46 @@ class TokenResponse(BaseModel):
 
 class OTPVerifyRequest(BaseModel):
     """Schema for OTP verification."""
-    email: EmailStr
+    model_config = DEFERRED
+    
+    email: Email
     otp_code: str
 
 
 class RefreshTokenRequest(BaseModel):
     """Schema for token refresh."""
+    model_config = DEFERRED
+    
     refresh_token: str
 
 
 class TOTPEnrollRequest(BaseModel):
     """Schema for initiating TOTP enrollment (after password login)."""
-    email: EmailStr
+    model_config = DEFERRED
+    
+    email: Email
 
 
 class TOTPEnrollResponse(BaseModel):
     """Schema for TOTP enrollment with QR code."""
-    qr_code: str  # Base64 encoded QR code image
+    model_config = DEFERRED
+    
+    qr_code: str  # QR code image as an SVG data URL
     secret: str  # Base32 encoded secret (for backup)
     message: str = "Scan the QR code with your authenticator app and confirm with your first OTP"
 
 
 class TOTPVerifyRequest(BaseModel):
     """Schema for TOTP code verification during enrollment or login."""
-    email: EmailStr
+    model_config = DEFERRED
+    
+    email: Email
     totp_code: str  # 6-digit code from authenticator app
 
 
 class MFAStatusResponse(BaseModel):
     """Schema for MFA enrollment status."""
+    model_config = DEFERRED
+    
     mfa_enabled: bool
     message: str
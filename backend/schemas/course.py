@@ -3,10 +3,14 @@ Course-related Pydantic schemas.
 """
 from pydantic import BaseModel, Field
 from typing import Optional
+from uuid import UUID
+from ._config import DEFERRED, FROM_ATTRIBUTES
 
 
 class CourseCreate(BaseModel):
     """Schema for creating a course."""
+    model_config = DEFERRED
+    
     name: str = Field(..., min_length=1, max_length=255)
     code: str = Field(..., min_length=1, max_length=50)
 
@@ -19,11 +23,12 @@ class CourseResponse(BaseModel):
     faculty_id: Optional[str] = None
     faculty_name: Optional[str] = None
     
-    class Config:
-        from_attributes = True
+    model_config = FROM_ATTRIBUTES
 
 
 class AssignFaculty(BaseModel):
     """Schema for assigning faculty to course."""
-    course_id: str
-    faculty_id: str
+    model_config = DEFERRED
+    
+    course_id: UUID
+    faculty_id: UUID
@@ -1,14 +1,17 @@
 """
 Submission/Grading-related Pydantic schemas.
 """
-from pydantic import BaseModel, Field, field_serializer
+from pydantic import BaseModel, Field
 from typing import Optional
 from uuid import UUID
 from datetime import datetime
+from ._config import DEFERRED, FROM_ATTRIBUTES
 
 
 class GradeAssignment(BaseModel):
     """Schema for faculty grading an assignment."""
+    model_config = DEFERRED
+    
     marks: int = Field(..., ge=0, le=100)
     feedback: Optional[str] = None
 
@@ -22,11 +25,6 @@ class SubmissionResponse(BaseModel):
     marks: int
     feedback: Optional[str]
     graded_timestamp: datetime
+    # UUIDs are written as strings by pydantic-core's JSON mode / orjson
     
-    # Serialize UUIDs to strings for JSON response
-    @field_serializer('id', 'assignment_id', 'faculty_id')
-    def serialize_uuid(self, value: UUID) -> str:
-        return str(value)
-    
-    class Config:
-        from_attributes = True
+    model_config = FROM_ATTRIBUTES
@@ -1,24 +1,30 @@
 """
 User-related Pydantic schemas for request/response validation.
 """
-from pydantic import BaseModel, EmailStr, Field, field_serializer
+from pydantic import BaseModel, Field
 from typing import Optional
 from uuid import UUID
 from models.user import UserRole
 from datetime import datetime
+from ._config import DEFERRED, FROM_ATTRIBUTES
+from ._types import Email
 
 
 class UserCreate(BaseModel):
     """Schema for user registration."""
+    model_config = DEFERRED
+    
     name: str = Field(..., min_length=1, max_length=255)
-    email: EmailStr
+    email: Email
     password: str = Field(..., min_length=8, max_length=100)
     role: UserRole = UserRole.STUDENT
 
 
 class UserLogin(BaseModel):
     """Schema for user login."""
-    email: EmailStr
+    model_config = DEFERRED
+    
+    email: Email
     password: str
 
 
@@ -29,17 +35,14 @@ class UserResponse(BaseModel):
     email: str
     role: UserRole
     created_at: datetime
+    # UUIDs are written as strings by pydantic-core's JSON mode / orjson
     
-    # Serialize UUID to string for JSON response
-    @field_serializer('id')
-    def serialize_id(self, value: UUID) -> str:
-        return str(value)
-    
-    class Config:
-        from_attributes = True
+    model_config = FROM_ATTRIBUTES
 
 
 class UserUpdate(BaseModel):
     """Schema for updating user information."""
+    model_config = DEFERRED
+    
     name: Optional[str] = Field(None, min_length=1, max_length=255)
     role: Optional[UserRole] = None
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Database initialization and seed data script.
+Creates tables, sample users and courses in a single transaction.
+
+Usage:
+    python -m seed                # tables + users + courses
+    python -m seed --users        # tables + users only
+    python -m seed --courses      # tables + courses (faculty must already exist)
+"""
+import sys
+import os
+import argparse
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from database import script_engine, Base
+from models.user import User, UserRole
+from models.course import Course
+from seed_cache import cached_password_hash, cached_rsa_keypairs
+
+# Seeded accounts are hashed with the API's own argon2id parameters, so
+# password_needs_rehash doesn't rehash each of them on first login. Hashes
+# are cached per password, so this costs one hash per distinct password.
+from utils.auth import password_hasher
+
+USERS = [
+    ("Admin User", "admin@example.com", "admin123", UserRole.ADMIN),
+    ("Dr. John Smith", "john.smith@faculty.com", "faculty123", UserRole.FACULTY),
+    ("Dr. Sarah Johnson", "sarah.johnson@faculty.com", "faculty123", UserRole.FACULTY),
+    ("Dr. Michael Brown", "michael.brown@faculty.com", "faculty123", UserRole.FACULTY),
+    ("Alice Williams", "alice@student.com", "student123", UserRole.STUDENT),
+    ("Bob Davis", "bob@student.com", "student123", UserRole.STUDENT),
+    ("Charlie Miller", "charlie@student.com", "student123", UserRole.STUDENT),
+]
+
+# (code, name, faculty email)
+COURSES = [
+    ("CS201", "Data Structures and Algorithms", "john.smith@faculty.com"),
+    ("CS301", "Database Systems", "sarah.johnson@faculty.com"),
+    ("CS302", "Web Development", "michael.brown@faculty.com"),
+    ("CS401", "Computer Security", "john.smith@faculty.com"),
+    ("CS402", "Operating Systems", "john.smith@faculty.com"),
+]
+
+
+def seed_users(conn):
+    """Insert any missing sample users."""
+    print("\n👥 Users")
+
+    # One query for every seed email, so existing users skip hashing and keygen
+    emails = [email for _, email, _, _ in USERS]
+    existing = set(conn.scalars(select(User.email).where(User.email.in_(emails))))
+    missing = [user for user in USERS if user[1] not in existing]
+
+    # Load (or generate in parallel) every new user's key pair up front
+    keypairs = cached_rsa_keypairs([email for _, email, _, _ in missing])
+
+    rows = []
+    for name, email, password, role in missing:
+        pub, priv = keypairs[email]
+        rows.append({
+            "name": name,
+            "email": email,
+            "role": role,
+            "password_hash": cached_password_hash(password, password_hasher),
+            "public_key_pem": pub,
+            # Only faculty need a private key (for signing grades)
+            "private_key_pem": priv if role == UserRole.FACULTY else None
+        })
+
+    # ON CONFLICT DO NOTHING keeps this safe against a concurrent seed run
+    created = set()
+    if rows:
+        created = set(conn.scalars(
+            pg_insert(User)
+            .on_conflict_do_nothing(index_elements=[User.email])
+            .returning(User.email),
+            rows
+        ))
+
+    for name, email, password, role in USERS:
+        status = "Created" if email in created else "Exists "
+        print(f"  ✓ {status}: {email} / {password} ({role.value})")
+
+
+def seed_courses(conn):
+    """Insert any missing sample courses."""
+    print("\n📚 Courses")
+
+    faculty_emails = {email for _, _, email in COURSES}
+    faculty_ids = dict(conn.execute(
+        select(User.email, User.id).where(User.email.in_(faculty_emails))
+    ).all())
+
+    missing_faculty = faculty_emails - faculty_ids.keys()
+    if missing_faculty:
+        print(f"  ❌ Faculty not found: {', '.join(sorted(missing_faculty))}")
+        print("     Run: python -m seed --users")
+        return
+
+    rows = [
+        {"code": code, "name": name, "faculty_id": faculty_ids[email]}
+        for code, name, email in COURSES
+    ]
+    created = set(conn.scalars(
+        pg_insert(Course)
+        .on_conflict_do_nothing(index_elements=[Course.code])
+        .returning(Course.code),
+        rows
+    ))
+
+    for code, name, email in COURSES:
+        status = "Created" if code in created else "Exists "
+        print(f"  ✓ {status}: {code} - {name} ({email})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Create tables and seed sample data.")
+    parser.add_argument("--users", action="store_true", help="seed sample users")
+    parser.add_argument("--courses", action="store_true", help="seed sample courses")
+    args = parser.parse_args()
+
+    # No flags means seed everything
+    seed_all = not (args.users or args.courses)
+
+    print("="*60)
+    print("DATABASE INITIALIZATION")
+    print("="*60)
+
+    try:
+        # One connection, one transaction: everything or nothing is seeded
+        with script_engine.begin() as conn:
+            Base.metadata.create_all(bind=conn)
+            print("✓ Tables created")
+
+            if seed_all or args.users:
+                seed_users(conn)
+            if seed_all or args.courses:
+                seed_courses(conn)
+    except Exception as e:
+        print(f"\n❌ Error seeding database: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+    print("\n" + "="*60)
+    print("✅ Database initialization complete!")
+    print("="*60)
+    print("\nRemember: After login, check backend console for OTP!")
+
+
+if __name__ == "__main__":
+    main()
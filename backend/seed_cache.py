@@ -0,0 +1,80 @@
+"""
+On-disk cache for deterministic seed fixtures.
+
+Seed scripts create the same test users on every run, so the expensive parts
+(argon2 password hashes, RSA key generation) are computed once and reused.
+Only used by the seed scripts - never by the API.
+"""
+import os
+import json
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from argon2 import PasswordHasher
+
+from utils.encryption import generate_rsa_keypairs
+
+CACHE_DIR = Path.home() / ".cache" / "secure-assignment-submission"
+HASH_CACHE_PATH = CACHE_DIR / "test_user_hashes.json"
+KEYPAIR_CACHE_PATH = CACHE_DIR / "test_user_keypairs_by_email.json"
+
+
+def _load(path: Path):
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return None
+
+
+def _save(path: Path, data):
+    """Write cache file readable by the current user only (best-effort)."""
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f)
+    except OSError:
+        pass
+
+
+def cached_password_hash(password: str, hasher: PasswordHasher) -> str:
+    """
+    Return the cached hash for a fixture password, hashing it on first use.
+    
+    Cached hashes made with other argon2 parameters are replaced, so seeded
+    accounts always match the hasher's current parameters.
+    
+    Args:
+        password: Plain-text fixture password
+        hasher: Hasher used on a cache miss or a stale cached hash
+        
+    Returns:
+        Password hash
+    """
+    hashes = _load(HASH_CACHE_PATH) or {}
+    if password not in hashes or hasher.check_needs_rehash(hashes[password]):
+        hashes[password] = hasher.hash(password)
+        _save(HASH_CACHE_PATH, hashes)
+    return hashes[password]
+
+
+def cached_rsa_keypairs(emails: List[str]) -> Dict[str, Tuple[str, str]]:
+    """
+    Return one RSA key pair per fixture user, generating only the ones not already cached.
+    
+    Pairs are cached per email, so a key pair is only ever handed to the user
+    it was generated for (two users never share a key, however often the
+    database is reset and partially re-seeded).
+    
+    Args:
+        emails: Emails of the users that need a key pair
+        
+    Returns:
+        Dict of email -> (public_key_pem, private_key_pem)
+    """
+    cache = _load(KEYPAIR_CACHE_PATH) or {}
+    missing = [email for email in emails if email not in cache]
+    if missing:
+        cache.update(zip(missing, generate_rsa_keypairs(len(missing))))
+        _save(KEYPAIR_CACHE_PATH, cache)
+    return {email: tuple(cache[email]) for email in emails}
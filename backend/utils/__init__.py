@@ -2,7 +2,7 @@
 Security utilities package.
 """
 from .auth import hash_password, verify_password, create_access_token, verify_token
-from .encryption import generate_rsa_keypair, encrypt_file_hybrid, decrypt_file_hybrid
+from .encryption import generate_rsa_keypair, generate_rsa_keypairs, encrypt_file_hybrid, encrypt_and_hash, decrypt_file_hybrid, wrap_aes_key, unwrap_aes_key, decrypted_size, decrypt_stream
 from .signature import generate_file_hash, sign_hash, verify_signature
 from .otp import generate_otp, send_otp_email
 from .acl import require_role, require_permission, check_permission
@@ -13,8 +13,14 @@ __all__ = [
     "create_access_token",
     "verify_token",
     "generate_rsa_keypair",
+    "generate_rsa_keypairs",
     "encrypt_file_hybrid",
+    "encrypt_and_hash",
     "decrypt_file_hybrid",
+    "wrap_aes_key",
+    "unwrap_aes_key",
+    "decrypted_size",
+    "decrypt_stream",
     "generate_file_hash",
     "sign_hash",
     "verify_signature",
@@ -2,37 +2,68 @@
 Access Control List (ACL) implementation for role-based permissions.
 Implements RBAC (Role-Based Access Control) with permission checking.
 """
-from functools import wraps
-from typing import List, Callable
+from typing import Any, Dict, List
 from fastapi import HTTPException, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
 from models.user import UserRole, User
 from utils.auth import verify_token
+from utils.ttl_cache import TTLCache
 from database import get_db
+from config import settings
+import uuid
 
 security = HTTPBearer()
 
+# Resolved principals by user id, so most requests skip the users lookup.
+# Only the columns routes read off current_user are kept; anything else
+# (e.g. private_key_pem) has to be selected explicitly by the route.
+# The TTL bounds staleness from changes made outside this worker
+# (other workers, make_admin.py); changes made here invalidate immediately.
+_PRINCIPAL_COLUMNS = ("id", "name", "email", "role", "mfa_enabled", "created_at")
+_principal_cache = TTLCache(
+    maxsize=settings.USER_CACHE_MAX_ENTRIES,
+    ttl=settings.USER_CACHE_TTL_SECONDS
+)
 
-# Permission definitions for ACL
+
+def invalidate_cached_user(user_id) -> None:
+    """
+    Drop a cached principal after its role or MFA state changed.
+    
+    Args:
+        user_id: User ID (UUID or string)
+    """
+    _principal_cache.pop(str(user_id))
+
+
+# Permission definitions for ACL (permission -> roles that hold it)
 PERMISSIONS = {
     # Assignment permissions
-    "assignment:create": [UserRole.STUDENT],
-    "assignment:read_own": [UserRole.STUDENT, UserRole.FACULTY, UserRole.ADMIN],
-    "assignment:read_others": [UserRole.FACULTY, UserRole.ADMIN],
-    "assignment:download": [UserRole.FACULTY, UserRole.ADMIN],
-    "assignment:grade": [UserRole.FACULTY],
+    "assignment:create": frozenset({UserRole.STUDENT}),
+    "assignment:read_own": frozenset({UserRole.STUDENT, UserRole.FACULTY, UserRole.ADMIN}),
+    "assignment:read_others": frozenset({UserRole.FACULTY, UserRole.ADMIN}),
+    "assignment:download": frozenset({UserRole.FACULTY, UserRole.ADMIN}),
+    "assignment:grade": frozenset({UserRole.FACULTY}),
     
     # User management permissions
-    "user:create": [UserRole.ADMIN],
-    "user:read": [UserRole.ADMIN],
-    "user:update": [UserRole.ADMIN],
-    "user:delete": [UserRole.ADMIN],
+    "user:create": frozenset({UserRole.ADMIN}),
+    "user:read": frozenset({UserRole.ADMIN}),
+    "user:update": frozenset({UserRole.ADMIN}),
+    "user:delete": frozenset({UserRole.ADMIN}),
     
     # Course permissions
-    "course:create": [UserRole.ADMIN],
-    "course:assign_faculty": [UserRole.ADMIN],
-    "course:read": [UserRole.STUDENT, UserRole.FACULTY, UserRole.ADMIN],
+    "course:create": frozenset({UserRole.ADMIN}),
+    "course:assign_faculty": frozenset({UserRole.ADMIN}),
+    "course:read": frozenset({UserRole.STUDENT, UserRole.FACULTY, UserRole.ADMIN}),
+}
+
+
+# Inverted once at import: role -> permissions it holds
+ROLE_PERMISSIONS = {
+    role: frozenset(permission for permission, roles in PERMISSIONS.items() if role in roles)
+    for role in UserRole
 }
 
 
@@ -40,6 +71,8 @@ def check_permission(role: UserRole, permission: str) -> bool:
     """
     Check if a role has a specific permission.
     
+    A dict lookup plus a frozenset membership test against ROLE_PERMISSIONS.
+    
     Args:
         role: User role
         permission: Permission string (e.g., "assignment:create")
@@ -47,31 +80,29 @@ def check_permission(role: UserRole, permission: str) -> bool:
     Returns:
         True if role has permission, False otherwise
     """
-    allowed_roles = PERMISSIONS.get(permission, [])
-    return role in allowed_roles
+    return permission in ROLE_PERMISSIONS.get(role, ())
 
 
-def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-):
+async def get_current_payload(
+    credentials: HTTPAuthorizationCredentials = Depends(security)
+) -> Dict[str, Any]:
     """
-    Dependency to get current authenticated user from JWT token.
+    Dependency to get the verified JWT payload, without a user lookup.
+    
+    For routes that only need the caller's identity (payload["user_id"]).
+    Anything that depends on the caller's role must use get_current_user,
+    since a token keeps the role it was issued with.
     
     Args:
         credentials: HTTP Bearer token
-        db: Database session
         
     Returns:
-        Current user object
+        Decoded token payload
         
     Raises:
-        HTTPException: If token is invalid or user not found
+        HTTPException: If token is invalid or has no user_id
     """
-    from models.user import User
-    
-    token = credentials.credentials
-    payload = verify_token(token)
+    payload = verify_token(credentials.credentials)
     
     if payload is None:
         raise HTTPException(
@@ -80,166 +111,130 @@ def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    user_id = payload.get("user_id")
-    if user_id is None:
+    if payload.get("user_id") is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid token payload",
         )
     
-    user = db.query(User).filter(User.id == user_id).first()
+    return payload
+
+
+async def get_current_user(
+    payload: Dict[str, Any] = Depends(get_current_payload),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Dependency to get current authenticated user from JWT token.
+    
+    Args:
+        payload: Verified token payload (decoded once per request)
+        db: Database session
+        
+    Returns:
+        Current user object
+        
+    Raises:
+        HTTPException: If user not found
+    """
+    user_id = payload["user_id"]
+    
+    cached = _principal_cache.get(user_id)
+    if cached is not None:
+        # Attach a detached copy to this session without a SELECT
+        user = User(**cached)
+        make_transient_to_detached(user)
+        return await db.merge(user, load=False)
+    
+    try:
+        user_uuid = uuid.UUID(user_id)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid token payload",
+        )
+    
+    # Primary-key lookup: answered from the session's identity map when the
+    # user is already loaded, otherwise a single SELECT by id
+    user = await db.get(User, user_uuid)
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found",
         )
     
+    _principal_cache.set(user_id, {column: getattr(user, column) for column in _PRINCIPAL_COLUMNS})
     return user
 
 
 def require_role(allowed_roles: List[UserRole]):
     """
-    Decorator to require specific roles for endpoint access.
+    Dependency factory requiring one of the given roles.
     
     Usage:
-        @router.get("/student-only")
-        @require_role([UserRole.STUDENT])
-        def student_endpoint(current_user: User = Depends(get_current_user)):
+        @router.get("/staff-only")
+        async def staff_endpoint(current_user: User = Depends(require_role([UserRole.FACULTY, UserRole.ADMIN]))):
             ...
     
     Args:
         allowed_roles: List of roles allowed to access the endpoint
         
     Returns:
-        Decorator function
+        Dependency returning the current user if the role check passes
     """
-    def decorator(func: Callable):
-        @wraps(func)
-        async def async_wrapper(*args, **kwargs):
-            # Get current_user from kwargs
-            current_user = kwargs.get("current_user")
-            if current_user is None:
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Authentication required"
-                )
-            
-            if current_user.role not in allowed_roles:
-                raise HTTPException(
-                    status_code=status.HTTP_403_FORBIDDEN,
-                    detail=f"Access denied. Required roles: {[r.value for r in allowed_roles]}"
-                )
-            
-            # Check if function is async
-            import asyncio
-            if asyncio.iscoroutinefunction(func):
-                return await func(*args, **kwargs)
-            else:
-                return func(*args, **kwargs)
-        
-        @wraps(func)
-        def sync_wrapper(*args, **kwargs):
-            # Get current_user from kwargs
-            current_user = kwargs.get("current_user")
-            if current_user is None:
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Authentication required"
-                )
-            
-            if current_user.role not in allowed_roles:
-                raise HTTPException(
-                    status_code=status.HTTP_403_FORBIDDEN,
-                    detail=f"Access denied. Required roles: {[r.value for r in allowed_roles]}"
-                )
-            
-            return func(*args, **kwargs)
-        
-        # Return appropriate wrapper based on function type
-        import asyncio
-        if asyncio.iscoroutinefunction(func):
-            return async_wrapper
-        else:
-            return sync_wrapper
-    return decorator
+    allowed = frozenset(allowed_roles)
+    denied_detail = f"Access denied. Required roles: {[r.value for r in allowed_roles]}"
+    
+    async def dependency(current_user: User = Depends(get_current_user)):
+        if current_user.role not in allowed:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=denied_detail
+            )
+        return current_user
+    
+    return dependency
 
 
 def require_permission(permission: str):
     """
-    Decorator to require specific permission for endpoint access.
+    Dependency factory requiring an ACL permission.
     
     Usage:
         @router.post("/assignments")
-        @require_permission("assignment:create")
-        def create_assignment(current_user: User = Depends(get_current_user)):
+        async def create_assignment(current_user: User = Depends(require_permission("assignment:create"))):
             ...
     
     Args:
         permission: Permission string required
         
     Returns:
-        Decorator function
+        Dependency returning the current user if the permission check passes
     """
-    def decorator(func: Callable):
-        @wraps(func)
-        async def async_wrapper(*args, **kwargs):
-            current_user = kwargs.get("current_user")
-            if current_user is None:
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Authentication required"
-                )
-            
-            if not check_permission(current_user.role, permission):
-                raise HTTPException(
-                    status_code=status.HTTP_403_FORBIDDEN,
-                    detail=f"Access denied. Required permission: {permission}"
-                )
-            
-            # Check if function is async
-            import asyncio
-            if asyncio.iscoroutinefunction(func):
-                return await func(*args, **kwargs)
-            else:
-                return func(*args, **kwargs)
-        
-        @wraps(func)
-        def sync_wrapper(*args, **kwargs):
-            current_user = kwargs.get("current_user")
-            if current_user is None:
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Authentication required"
-                )
-            
-            if not check_permission(current_user.role, permission):
-                raise HTTPException(
-                    status_code=status.HTTP_403_FORBIDDEN,
-                    detail=f"Access denied. Required permission: {permission}"
-                )
-            
-            return func(*args, **kwargs)
-        
-        # Return appropriate wrapper based on function type
-        import asyncio
-        if asyncio.iscoroutinefunction(func):
-            return async_wrapper
-        else:
-            return sync_wrapper
-    return decorator
+    denied_detail = f"Access denied. Required permission: {permission}"
+    
+    async def dependency(current_user: User = Depends(get_current_user)):
+        if not check_permission(current_user.role, permission):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=denied_detail
+            )
+        return current_user
+    
+    return dependency
 
 
-# ===== FastAPI-compatible role dependencies =====
-# These are the CORRECT way to implement role-based access control in FastAPI.
-# Use these instead of the @require_role decorator.
+# ===== Single-role dependencies =====
+# The checks run once as FastAPI dependencies, with no wrapper around the
+# endpoint itself.
 
-def require_admin(current_user: User = Depends(get_current_user)):
+async def require_admin(current_user: User = Depends(get_current_user)):
     """
     Dependency that requires the user to have admin role.
     
     Usage:
         @router.get("/admin-only")
-        def admin_endpoint(current_user: User = Depends(require_admin), db: Session = Depends(get_db)):
+        async def admin_endpoint(current_user: User = Depends(require_admin), db: AsyncSession = Depends(get_db)):
             ...
     
     Args:
@@ -259,13 +254,13 @@ def require_admin(current_user: User = Depends(get_current_user)):
     return current_user
 
 
-def require_faculty(current_user: User = Depends(get_current_user)):
+async def require_faculty(current_user: User = Depends(get_current_user)):
     """
     Dependency that requires the user to have faculty role.
     
     Usage:
         @router.get("/faculty-only")
-        def faculty_endpoint(current_user: User = Depends(require_faculty), db: Session = Depends(get_db)):
+        async def faculty_endpoint(current_user: User = Depends(require_faculty), db: AsyncSession = Depends(get_db)):
             ...
     
     Args:
@@ -285,13 +280,13 @@ def require_faculty(current_user: User = Depends(get_current_user)):
     return current_user
 
 
-def require_student(current_user: User = Depends(get_current_user)):
+async def require_student(current_user: User = Depends(get_current_user)):
     """
     Dependency that requires the user to have student role.
     
     Usage:
         @router.get("/student-only")
-        def student_endpoint(current_user: User = Depends(require_student), db: Session = Depends(get_db)):
+        async def student_endpoint(current_user: User = Depends(require_student), db: AsyncSession = Depends(get_db)):
             ...
     
     Args:
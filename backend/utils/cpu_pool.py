@@ -0,0 +1,64 @@
+"""
+Process pool for CPU-heavy crypto (argon2, RSA private-key operations).
+Keeps password hashing and RSA work off the API process's GIL. Bulk AES and
+SHA-256 over file contents run in the threadpool instead: OpenSSL releases
+the GIL for them, and shipping whole files to a worker would copy them twice.
+"""
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable
+from fastapi.concurrency import run_in_threadpool
+
+
+class CPUBoundPool:
+    """
+    Runs module-level functions in worker processes.
+    
+    - Workers are spawned (not forked) so they don't inherit the event loop
+      or background threads of the API process
+    - Arguments and results must be picklable (PEM strings and bytes are)
+    - Until start() is called (scripts, tooling) work falls back to the threadpool
+    """
+    
+    def __init__(self):
+        self._executor = None
+    
+    def start(self, max_workers: int = 0) -> None:
+        """
+        Start the worker processes (idempotent).
+        
+        Args:
+            max_workers: Number of worker processes; 0 means one per CPU
+        """
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=max_workers or os.cpu_count(),
+                mp_context=multiprocessing.get_context("spawn")
+            )
+    
+    def shutdown(self) -> None:
+        """Stop the worker processes."""
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+    
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """
+        Run fn(*args) in a worker process and await the result.
+        
+        Args:
+            fn: Module-level (picklable) function
+            *args: Picklable positional arguments
+        
+        Returns:
+            Whatever fn returns
+        """
+        if self._executor is None:
+            return await run_in_threadpool(fn, *args)
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+
+# Global CPU-bound work pool instance
+cpu_pool = CPUBoundPool()
@@ -4,11 +4,67 @@ Uses cryptography library for secure encryption operations.
 """
 from cryptography.hazmat.primitives.asymmetric import rsa, padding
 from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives import padding as sym_padding
 from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
 from cryptography.hazmat.backends import default_backend
+from concurrent.futures import ProcessPoolExecutor
 import os
 import base64
-from typing import Tuple
+import hashlib
+from functools import lru_cache
+from typing import Iterator, List, Optional, Tuple
+
+# Files are encrypted/decrypted in blocks of this size so no full-size
+# intermediate copies are made
+CHUNK_SIZE = 1 << 20
+
+# RSA key-wrapping padding, built once (padding objects are immutable)
+_OAEP_PADDING = padding.OAEP(
+    mgf=padding.MGF1(algorithm=hashes.SHA256()),
+    algorithm=hashes.SHA256(),
+    label=None
+)
+
+
+@lru_cache(maxsize=1024)
+def load_public_key(public_key_pem: str) -> rsa.RSAPublicKey:
+    """
+    Parse a PEM public key, memoized per process.
+    
+    Keys never change once issued, so each worker parses a given user's
+    PEM once instead of on every upload/verification.
+    
+    Args:
+        public_key_pem: RSA public key in PEM format
+        
+    Returns:
+        Loaded public key object
+    """
+    return serialization.load_pem_public_key(
+        public_key_pem.encode('utf-8'),
+        backend=default_backend()
+    )
+
+
+@lru_cache(maxsize=1024)
+def load_private_key(private_key_pem: str) -> rsa.RSAPrivateKey:
+    """
+    Parse a PEM private key, memoized per process.
+    
+    Loading a private key also validates it (checking the primes), which
+    dominates the cost of a single sign/decrypt; caching pays it once.
+    
+    Args:
+        private_key_pem: RSA private key in PEM format
+        
+    Returns:
+        Loaded private key object
+    """
+    return serialization.load_pem_private_key(
+        private_key_pem.encode('utf-8'),
+        password=None,
+        backend=default_backend()
+    )
 
 
 def generate_rsa_keypair() -> Tuple[str, str]:
@@ -48,6 +104,31 @@ def generate_rsa_keypair() -> Tuple[str, str]:
     return public_pem, private_pem
 
 
+def _generate_rsa_keypair_worker(_: int) -> Tuple[str, str]:
+    """Process-pool entry point for generate_rsa_keypairs (must be picklable)."""
+    return generate_rsa_keypair()
+
+
+def generate_rsa_keypairs(count: int) -> List[Tuple[str, str]]:
+    """
+    Generate several RSA-2048 key pairs in parallel.
+    
+    Key generation is CPU-bound prime search with no shared state, so
+    spreading it across processes scales with the number of cores.
+    
+    Args:
+        count: Number of key pairs to generate
+        
+    Returns:
+        List of (public_key_pem, private_key_pem) tuples
+    """
+    if count <= 1:
+        return [generate_rsa_keypair() for _ in range(count)]
+    
+    with ProcessPoolExecutor(max_workers=min(count, os.cpu_count() or 1)) as executor:
+        return list(executor.map(_generate_rsa_keypair_worker, range(count)))
+
+
 def encrypt_file_hybrid(file_data: bytes, public_key_pem: str) -> Tuple[bytes, str]:
     """
     Encrypt file using hybrid encryption (AES-256 + RSA).
@@ -74,99 +155,224 @@ def encrypt_file_hybrid(file_data: bytes, public_key_pem: str) -> Tuple[bytes, s
     # Generate random AES-256 key (32 bytes = 256 bits)
     aes_key = os.urandom(32)
     
-    # Generate random IV (16 bytes for AES)
+    # Encrypt file with AES-256-CBC (random IV prepended to the output)
+    encrypted_file = _encrypt_cbc(file_data, aes_key)
+    
+    # Encrypt AES key with RSA
+    encrypted_aes_key_b64 = wrap_aes_key(aes_key, public_key_pem)
+    
+    return encrypted_file, encrypted_aes_key_b64
+
+
+def encrypt_and_hash(file_data: bytes, public_key_pem: str) -> Tuple[bytes, str, str]:
+    """
+    Hash and hybrid-encrypt a file in a single pass.
+    
+    Produces the same output format as encrypt_file_hybrid, but each chunk
+    feeds both the SHA-256 context and the AES encryptor while it is still
+    in cache, so the file is only read from memory once.
+    
+    Args:
+        file_data: Original file bytes
+        public_key_pem: RSA public key in PEM format
+        
+    Returns:
+        Tuple of (encrypted_file_bytes, sha256_hex, encrypted_aes_key_base64)
+    """
+    aes_key = os.urandom(32)
+    sha256 = hashlib.sha256()
+    encrypted_file = _encrypt_cbc(file_data, aes_key, sha256)
+    
+    return encrypted_file, sha256.hexdigest(), wrap_aes_key(aes_key, public_key_pem)
+
+
+def _encrypt_cbc(file_data: bytes, aes_key: bytes, sha256: "Optional[hashlib._Hash]" = None) -> bytearray:
+    """
+    AES-256-CBC encrypt a file in place into one preallocated buffer.
+    
+    Args:
+        file_data: Original file bytes
+        aes_key: Raw AES key
+        sha256: Optional hashlib context fed the plaintext as it is encrypted
+        
+    Returns:
+        Random IV followed by the PKCS7-padded ciphertext
+    """
     iv = os.urandom(16)
     
-    # Encrypt file with AES-256-CBC
-    cipher = Cipher(
+    encryptor = Cipher(
         algorithms.AES(aes_key),
         modes.CBC(iv),
         backend=default_backend()
-    )
-    encryptor = cipher.encryptor()
+    ).encryptor()
     
-    # Pad file data to multiple of 16 bytes (AES block size)
-    padding_length = 16 - (len(file_data) % 16)
-    padded_data = file_data + bytes([padding_length] * padding_length)
+    # Ciphertext is written in place into one preallocated buffer (IV first,
+    # needed for decryption): no per-chunk output objects and no final join.
+    # update_into() needs up to a block of slack past the data it writes.
+    block = algorithms.AES.block_size // 8
+    aligned = len(file_data) - len(file_data) % block
+    padding_length = block - len(file_data) % block
+    out = bytearray(block + aligned + block + (block - 1))
+    out[:block] = iv
     
-    encrypted_file = encryptor.update(padded_data) + encryptor.finalize()
+    view = memoryview(file_data)
+    out_view = memoryview(out)
+    pos = block
+    # Whole blocks go straight from the input to the cipher (CHUNK_SIZE is a
+    # multiple of the block size, so only the final block needs padding)
+    for offset in range(0, aligned, CHUNK_SIZE):
+        chunk = view[offset:min(offset + CHUNK_SIZE, aligned)]
+        if sha256 is not None:
+            sha256.update(chunk)
+        pos += encryptor.update_into(chunk, out_view[pos:])
     
-    # Prepend IV to encrypted file (needed for decryption)
-    encrypted_file_with_iv = iv + encrypted_file
+    # Last partial block plus PKCS7 padding (a full padding block if aligned)
+    tail = bytes(view[aligned:])
+    if sha256 is not None:
+        sha256.update(tail)
+    pos += encryptor.update_into(tail + bytes([padding_length] * padding_length), out_view[pos:])
+    encryptor.finalize()
     
-    # Load RSA public key
-    public_key = serialization.load_pem_public_key(
-        public_key_pem.encode('utf-8'),
-        backend=default_backend()
-    )
+    out_view.release()
+    del out[pos:]
     
-    # Encrypt AES key with RSA
+    return out
+
+
+def wrap_aes_key(aes_key: bytes, public_key_pem: str) -> str:
+    """
+    Encrypt an AES key with the recipient's RSA public key.
+    
+    Args:
+        aes_key: Raw AES key
+        public_key_pem: RSA public key in PEM format
+        
+    Returns:
+        Base64-encoded encrypted AES key
+    """
+    # Load RSA public key (cached)
+    public_key = load_public_key(public_key_pem)
+    
+    # Encrypt AES key with RSA (OAEP padding)
     encrypted_aes_key = public_key.encrypt(
         aes_key,
-        padding.OAEP(
-            mgf=padding.MGF1(algorithm=hashes.SHA256()),
-            algorithm=hashes.SHA256(),
-            label=None
-        )
+        _OAEP_PADDING
     )
     
     # Encode encrypted AES key to Base64 for storage
-    encrypted_aes_key_b64 = base64.b64encode(encrypted_aes_key).decode('utf-8')
-    
-    return encrypted_file_with_iv, encrypted_aes_key_b64
+    return base64.b64encode(encrypted_aes_key).decode('utf-8')
 
 
-def decrypt_file_hybrid(encrypted_file: bytes, encrypted_aes_key_b64: str, private_key_pem: str) -> bytes:
+def unwrap_aes_key(encrypted_aes_key_b64: str, private_key_pem: str) -> bytes:
     """
-    Decrypt file using hybrid decryption (RSA + AES).
-    
-    Decryption flow:
-    1. Decrypt AES key using RSA private key
-    2. Extract IV from encrypted file
-    3. Decrypt file with AES-256
-    4. Remove padding and return original file
+    Decrypt a file's AES key with the recipient's RSA private key.
     
     Args:
-        encrypted_file: Encrypted file bytes (with IV prepended)
         encrypted_aes_key_b64: Base64-encoded encrypted AES key
         private_key_pem: RSA private key in PEM format
         
     Returns:
-        Original file bytes
+        Raw 32-byte AES key
     """
-    # Load RSA private key
-    private_key = serialization.load_pem_private_key(
-        private_key_pem.encode('utf-8'),
-        password=None,
-        backend=default_backend()
-    )
+    # Load RSA private key (cached)
+    private_key = load_private_key(private_key_pem)
     
     # Decode and decrypt AES key
     encrypted_aes_key = base64.b64decode(encrypted_aes_key_b64)
-    aes_key = private_key.decrypt(
+    return private_key.decrypt(
         encrypted_aes_key,
-        padding.OAEP(
-            mgf=padding.MGF1(algorithm=hashes.SHA256()),
-            algorithm=hashes.SHA256(),
-            label=None
-        )
+        _OAEP_PADDING
     )
+
+
+def decrypted_size(encrypted_file: bytes, aes_key: bytes) -> int:
+    """
+    Plaintext length of an AES-256-CBC file, without decrypting it.
+    
+    In CBC the last block only depends on the ciphertext block before it, so
+    decrypting that one block reveals the padding length.
+    
+    Args:
+        encrypted_file: Encrypted file bytes (with IV prepended)
+        aes_key: AES key from unwrap_aes_key
+        
+    Returns:
+        Size of the original file in bytes
+        
+    Raises:
+        ValueError: If the ciphertext or its padding is malformed (e.g. wrong key)
+    """
+    if len(encrypted_file) < 32 or len(encrypted_file) % 16:
+        raise ValueError("Invalid ciphertext length")
+    
+    decryptor = Cipher(
+        algorithms.AES(aes_key),
+        modes.CBC(encrypted_file[-32:-16]),
+        backend=default_backend()
+    ).decryptor()
+    last_block = decryptor.update(encrypted_file[-16:]) + decryptor.finalize()
+    
+    padding_length = last_block[-1]
+    if not 1 <= padding_length <= 16 or last_block[-padding_length:] != bytes([padding_length]) * padding_length:
+        raise ValueError("Invalid padding")
+    
+    return len(encrypted_file) - 16 - padding_length
+
+
+def decrypt_stream(encrypted_file: bytes, aes_key: bytes, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """
+    Decrypt an AES-256-CBC file block by block.
     
-    # Extract IV (first 16 bytes)
-    iv = encrypted_file[:16]
-    encrypted_data = encrypted_file[16:]
+    Only one chunk of plaintext exists at a time, so a download can be
+    streamed to the client instead of buffering the whole file.
     
-    # Decrypt file with AES
-    cipher = Cipher(
+    Args:
+        encrypted_file: Encrypted file bytes (with IV prepended)
+        aes_key: AES key from unwrap_aes_key
+        chunk_size: Ciphertext bytes decrypted per yielded block
+        
+    Yields:
+        Plaintext blocks (padding removed from the last one)
+    """
+    # Extract IV (first 16 bytes); slice the rest without copying
+    view = memoryview(encrypted_file)
+    iv = view[:16]
+    
+    decryptor = Cipher(
         algorithms.AES(aes_key),
         modes.CBC(iv),
         backend=default_backend()
-    )
-    decryptor = cipher.decryptor()
-    decrypted_padded = decryptor.update(encrypted_data) + decryptor.finalize()
+    ).decryptor()
+    # Holds back the final block until finalize() so padding can be stripped
+    unpadder = sym_padding.PKCS7(algorithms.AES.block_size).unpadder()
     
-    # Remove padding
-    padding_length = decrypted_padded[-1]
-    decrypted_data = decrypted_padded[:-padding_length]
+    for offset in range(16, len(view), chunk_size):
+        block = unpadder.update(decryptor.update(view[offset:offset + chunk_size]))
+        if block:
+            yield block
     
-    return decrypted_data
+    tail = unpadder.update(decryptor.finalize()) + unpadder.finalize()
+    if tail:
+        yield tail
+
+
+def decrypt_file_hybrid(encrypted_file: bytes, encrypted_aes_key_b64: str, private_key_pem: str) -> bytes:
+    """
+    Decrypt file using hybrid decryption (RSA + AES).
+    
+    Decryption flow:
+    1. Decrypt AES key using RSA private key
+    2. Extract IV from encrypted file
+    3. Decrypt file with AES-256
+    4. Remove padding and return original file
+    
+    Args:
+        encrypted_file: Encrypted file bytes (with IV prepended)
+        encrypted_aes_key_b64: Base64-encoded encrypted AES key
+        private_key_pem: RSA private key in PEM format
+        
+    Returns:
+        Original file bytes
+    """
+    aes_key = unwrap_aes_key(encrypted_aes_key_b64, private_key_pem)
+    return b"".join(decrypt_stream(encrypted_file, aes_key))
@@ -0,0 +1,42 @@
+"""
+HTTP conditional-request helpers (ETag / If-None-Match).
+Lets polling clients revalidate cheaply and skip re-downloading unchanged JSON.
+"""
+import hashlib
+from fastapi import Request, Response
+
+
+def make_etag(body: bytes) -> str:
+    """
+    Build a strong ETag from a response body.
+    
+    Args:
+        body: Serialized response body
+    
+    Returns:
+        Quoted ETag string
+    """
+    return '"' + hashlib.sha256(body).hexdigest()[:16] + '"'
+
+
+def etag_response(request: Request, body: bytes, cache_control: str = "private, no-cache") -> Response:
+    """
+    Return the JSON body, or 304 Not Modified if the client already has it.
+    
+    Args:
+        request: Incoming request (read for If-None-Match)
+        body: Serialized JSON response body
+        cache_control: Cache-Control header value
+    
+    Returns:
+        200 response with the body, or an empty 304 response
+    """
+    etag = make_etag(body)
+    # Responses depend on the bearer token, so shared caches must key on it
+    headers = {"ETag": etag, "Cache-Control": cache_control, "Vary": "Authorization"}
+    
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and etag in (tag.strip() for tag in if_none_match.split(",")):
+        return Response(status_code=304, headers=headers)
+    
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -0,0 +1,65 @@
+"""
+Pool of pre-generated RSA key pairs.
+Moves RSA key generation (the slowest part of creating a user) off the request path.
+"""
+import asyncio
+from collections import deque
+from typing import Deque, Optional, Tuple
+from utils.cpu_pool import cpu_pool
+from utils.encryption import generate_rsa_keypair
+
+
+class RSAKeyPairPool:
+    """
+    Bounded pool of RSA key pairs, refilled in the crypto worker processes.
+    
+    - A background task keeps the pool topped up to `maxsize`, one key pair
+      at a time, so it never occupies more than one crypto worker
+    - Key generation holds the GIL for its whole run, so it never happens in
+      the API process itself: the event loop only awaits finished PEM strings
+    - get() returns a pooled key pair immediately when one is available
+    - If the pool is empty, it awaits a key pair generated by a worker
+    """
+    
+    def __init__(self, maxsize: int = 16):
+        self._pool: Deque[Tuple[str, str]] = deque()
+        self._maxsize = maxsize
+        self._task: Optional["asyncio.Task[None]"] = None
+    
+    def start(self) -> None:
+        """Start the background refill task (idempotent; needs a running event loop)."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._fill())
+    
+    async def stop(self) -> None:
+        """Cancel the background refill task."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+    
+    async def _fill(self) -> None:
+        while len(self._pool) < self._maxsize:
+            self._pool.append(await cpu_pool.run(generate_rsa_keypair))
+    
+    async def get(self) -> Tuple[str, str]:
+        """
+        Take a key pair from the pool.
+        
+        Returns:
+            Tuple of (public_key_pem, private_key_pem) as strings
+        """
+        try:
+            keypair = self._pool.popleft()
+        except IndexError:
+            # Pool drained by a burst of sign-ups - don't wait for the refill task
+            keypair = await cpu_pool.run(generate_rsa_keypair)
+        self.start()
+        return keypair
+
+
+# Global key pair pool instance
+keypair_pool = RSAKeyPairPool()
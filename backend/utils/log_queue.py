@@ -0,0 +1,45 @@
+"""
+Non-blocking logging setup.
+Request handlers only enqueue records; a background listener thread does the I/O.
+"""
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+_listener: Optional[QueueListener] = None
+_queue_handler: Optional[QueueHandler] = None
+
+
+def start_logging(debug: bool = False) -> None:
+    """
+    Route the root logger through a queue drained by a background thread (idempotent).
+    
+    Args:
+        debug: Log at DEBUG (security walkthrough output) instead of INFO
+    """
+    global _listener, _queue_handler
+    if _listener is not None:
+        return
+    
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    
+    root = logging.getLogger()
+    root.setLevel(logging.DEBUG if debug else logging.INFO)
+    _queue_handler = QueueHandler(log_queue)
+    root.addHandler(_queue_handler)
+    
+    _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+
+
+def stop_logging() -> None:
+    """Flush queued records and stop the listener thread."""
+    global _listener, _queue_handler
+    if _listener is not None:
+        logging.getLogger().removeHandler(_queue_handler)
+        _listener.stop()
+        _listener = None
+        _queue_handler = None
@@ -2,11 +2,15 @@
 OTP (One-Time Password) utilities for multi-factor authentication.
 Simulates email sending by logging to console.
 """
-import random
-import string
+import hashlib
+import hmac
+import logging
+import secrets
 from datetime import datetime, timedelta, timezone
 from config import settings
 
+logger = logging.getLogger(__name__)
+
 
 def generate_otp() -> str:
     """
@@ -14,14 +18,37 @@ def generate_otp() -> str:
     
     Security features:
     - 6 digits (1,000,000 combinations)
-    - Random generation
+    - Cryptographically secure random generation (secrets)
     - Time-limited (5 minutes default)
     - Single-use
     
     Returns:
         6-digit OTP string
     """
-    return ''.join(random.choices(string.digits, k=6))
+    return f"{secrets.randbelow(1_000_000):06d}"
+
+
+def hash_otp(otp: str) -> bytes:
+    """
+    Keyed hash of an OTP code for storage and lookup.
+    
+    Only the HMAC-SHA256 digest (keyed with SECRET_KEY) is stored, so codes
+    never sit in the database in plaintext and verification is an exact
+    match on an indexed digest instead of a string comparison in Python.
+    
+    The database's early-exit comparison only ever sees digests: timing can
+    at most reveal a prefix of a digest, and without the key an attacker
+    can't choose codes whose digests share that prefix, so the lookup
+    leaks nothing about the code itself (same reasoning as comparing MACs
+    with hmac.compare_digest).
+    
+    Args:
+        otp: 6-digit OTP code
+        
+    Returns:
+        32-byte HMAC-SHA256 digest
+    """
+    return hmac.new(settings.SECRET_KEY.encode(), otp.encode(), hashlib.sha256).digest()
 
 
 def send_otp_email(email: str, otp: str, expiry: datetime) -> None:
@@ -34,22 +61,23 @@ def send_otp_email(email: str, otp: str, expiry: datetime) -> None:
     - Mailgun
     - SMTP
     
-    For development/testing, we log the OTP to console.
+    For development/testing, we log the OTP instead.
     
     Args:
         email: Recipient email address
         otp: 6-digit OTP code
         expiry: OTP expiration timestamp
     """
-    print("\n" + "="*60)
-    print("📧 [SIMULATED EMAIL - OTP]")
-    print("="*60)
-    print(f"To: {email}")
-    print(f"Subject: Your Login OTP Code")
-    print(f"\nYour OTP code is: {otp}")
-    print(f"This code will expire at: {expiry.strftime('%Y-%m-%d %H:%M:%S UTC')}")
-    print(f"Valid for: {settings.OTP_EXPIRE_MINUTES} minutes")
-    print("="*60 + "\n")
+    # One record through the queued logging setup (utils.log_queue): the
+    # request only enqueues it, the listener thread does the write
+    logger.info(
+        "[SIMULATED EMAIL - OTP]\n"
+        "  To: %s\n"
+        "  Subject: Your Login OTP Code\n"
+        "  Your OTP code is: %s\n"
+        "  This code will expire at: %s (valid for %d minutes)",
+        email, otp, expiry.strftime('%Y-%m-%d %H:%M:%S UTC'), settings.OTP_EXPIRE_MINUTES
+    )
 
 
 def get_otp_expiry() -> datetime:
@@ -2,11 +2,19 @@
 Rate limiting for OTP attempts to prevent brute force attacks.
 Uses in-memory store with exponential backoff.
 """
-from datetime import datetime, timedelta
+from dataclasses import dataclass
 from typing import Dict, Tuple
 import time
 
 
+@dataclass(slots=True)
+class _AttemptRecord:
+    """Failed-attempt state for one email, updated in place."""
+    count: int = 0
+    last_attempt: float = 0.0
+    locked_until: float = 0.0  # 0 while not locked
+
+
 class OTPRateLimiter:
     """
     Rate limiter for OTP verification attempts.
@@ -15,14 +23,21 @@ class OTPRateLimiter:
     - Tracks failed attempts per user
     - Progressive delays after failures
     - Automatic reset after success or lockout expiry
+    
+    Times come from time.monotonic(), so wall-clock jumps can't shorten or
+    extend a lockout.
     """
     
     def __init__(self):
-        # Store: {email: (attempt_count, last_attempt_time, locked_until)}
-        self._attempts: Dict[str, Tuple[int, float, float]] = {}
+        # Store: {email: _AttemptRecord}
+        self._attempts: Dict[str, _AttemptRecord] = {}
         self.max_attempts = 5  # Lock after 5 failed attempts
         self.lockout_duration_seconds = 900  # 15 minutes
         self.base_delay_seconds = 2
+        # Stale records are swept every this many new emails, so the store
+        # stays bounded under traffic spraying many addresses
+        self.sweep_interval = 1024
+        self._inserts_since_sweep = 0
     
     def is_rate_limited(self, email: str) -> Tuple[bool, int]:
         """
@@ -30,23 +45,23 @@ class OTPRateLimiter:
         
         Args:
             email: User email address
-            
+        
         Returns:
             Tuple of (is_limited: bool, seconds_until_retry: int)
         """
-        if email not in self._attempts:
+        record = self._attempts.get(email)
+        if record is None or not record.locked_until:
             return False, 0
         
-        attempt_count, last_attempt_time, locked_until = self._attempts[email]
-        current_time = time.time()
+        current_time = time.monotonic()
         
         # Check if lockout has expired
-        if current_time > locked_until:
+        if current_time > record.locked_until:
             del self._attempts[email]
             return False, 0
         
         # User is locked out
-        seconds_remaining = int(locked_until - current_time)
+        seconds_remaining = int(record.locked_until - current_time)
         return True, seconds_remaining
     
     def record_failed_attempt(self, email: str) -> Tuple[int, bool]:
@@ -55,42 +70,35 @@ class OTPRateLimiter:
         
         Args:
             email: User email address
-            
+        
         Returns:
             Tuple of (remaining_attempts: int, is_now_locked: bool)
         """
-        current_time = time.time()
+        current_time = time.monotonic()
         
-        if email not in self._attempts:
+        record = self._attempts.get(email)
+        if record is None:
             # First failed attempt
-            self._attempts[email] = (1, current_time, 0)
-            remaining_attempts = self.max_attempts - 1
-            is_locked = False
-        else:
-            attempt_count, last_attempt_time, locked_until = self._attempts[email]
-            
-            # Check if lockout has expired
-            if current_time > locked_until and locked_until > 0:
-                self._attempts[email] = (1, current_time, 0)
-                remaining_attempts = self.max_attempts - 1
-                is_locked = False
-            else:
-                # Increment attempt count
-                attempt_count += 1
-                
-                # Check if max attempts exceeded
-                is_locked = attempt_count >= self.max_attempts
-                
-                if is_locked:
-                    # Lock account for lockout duration
-                    new_locked_until = current_time + self.lockout_duration_seconds
-                    self._attempts[email] = (attempt_count, current_time, new_locked_until)
-                    remaining_attempts = 0
-                else:
-                    self._attempts[email] = (attempt_count, current_time, 0)
-                    remaining_attempts = self.max_attempts - attempt_count
+            self._inserts_since_sweep += 1
+            if self._inserts_since_sweep >= self.sweep_interval:
+                self._sweep(current_time)
+            record = self._attempts[email] = _AttemptRecord()
+        elif self._is_stale(record, current_time):
+            # Lockout (or an old run of failures) has expired: start over
+            record.count = 0
+            record.locked_until = 0.0
         
-        return remaining_attempts, is_locked
+        record.count += 1
+        record.last_attempt = current_time
+        
+        # Check if max attempts exceeded
+        is_locked = record.count >= self.max_attempts
+        if is_locked:
+            # Lock account for lockout duration
+            record.locked_until = current_time + self.lockout_duration_seconds
+            return 0, True
+        
+        return self.max_attempts - record.count, False
     
     def record_successful_attempt(self, email: str) -> None:
         """
@@ -99,7 +107,18 @@ class OTPRateLimiter:
         Args:
             email: User email address
         """
-        if email in self._attempts:
+        self._attempts.pop(email, None)
+    
+    def _is_stale(self, record: _AttemptRecord, current_time: float) -> bool:
+        """Whether a record's lockout, or its last failure, is long past."""
+        if record.locked_until:
+            return current_time > record.locked_until
+        return current_time - record.last_attempt > self.lockout_duration_seconds
+    
+    def _sweep(self, current_time: float) -> None:
+        """Drop every stale record."""
+        self._inserts_since_sweep = 0
+        for email in [e for e, r in self._attempts.items() if self._is_stale(r, current_time)]:
             del self._attempts[email]
 
 
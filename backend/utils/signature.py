@@ -4,12 +4,25 @@ Provides file integrity verification and non-repudiation.
 """
 import hashlib
 import base64
+import re
+from typing import BinaryIO, Union
+from cryptography.exceptions import InvalidSignature
 from cryptography.hazmat.primitives.asymmetric import padding
-from cryptography.hazmat.primitives import hashes, serialization
-from cryptography.hazmat.backends import default_backend
+from cryptography.hazmat.primitives import hashes
+from utils.encryption import load_private_key, load_public_key
 
+# Signature parameters are immutable, so they are built once and shared
+_PSS_PADDING = padding.PSS(
+    mgf=padding.MGF1(hashes.SHA256()),
+    salt_length=padding.PSS.MAX_LENGTH
+)
+_SHA256 = hashes.SHA256()
 
-def generate_file_hash(file_data: bytes) -> str:
+# Shape of a SHA-256 hex digest, checked before any crypto work
+_HEX_DIGEST = re.compile(r"[0-9a-fA-F]{64}")
+
+
+def generate_file_hash(file_data: Union[bytes, BinaryIO]) -> str:
     """
     Generate SHA-256 hash of file for integrity verification.
     
@@ -18,14 +31,20 @@ def generate_file_hash(file_data: bytes) -> str:
     - Collision-resistant
     - Used as input for digital signatures
     
+    Both paths go through OpenSSL's EVP SHA-256 (SHA-NI accelerated where
+    the CPU has it) and release the GIL while hashing.
+    
     Args:
-        file_data: File bytes to hash
+        file_data: File bytes, or a binary file object opened for reading
         
     Returns:
         Hexadecimal string representation of SHA-256 hash (64 characters)
     """
-    sha256_hash = hashlib.sha256(file_data).hexdigest()
-    return sha256_hash
+    if isinstance(file_data, (bytes, bytearray, memoryview)):
+        return hashlib.sha256(file_data).hexdigest()
+    
+    # File objects are hashed in fixed-size reads without loading them whole
+    return hashlib.file_digest(file_data, "sha256").hexdigest()
 
 
 def sign_hash(file_hash: str, private_key_pem: str) -> str:
@@ -50,13 +69,15 @@ def sign_hash(file_hash: str, private_key_pem: str) -> str:
         
     Returns:
         Base64-encoded signature string
+        
+    Raises:
+        ValueError: If file_hash is not a SHA-256 hex digest
     """
-    # Load private key
-    private_key = serialization.load_pem_private_key(
-        private_key_pem.encode('utf-8'),
-        password=None,
-        backend=default_backend()
-    )
+    if not _HEX_DIGEST.fullmatch(file_hash):
+        raise ValueError("Invalid SHA-256 hex digest")
+    
+    # Load private key (cached)
+    private_key = load_private_key(private_key_pem)
     
     # Convert hex hash to bytes
     hash_bytes = bytes.fromhex(file_hash)
@@ -64,11 +85,8 @@ def sign_hash(file_hash: str, private_key_pem: str) -> str:
     # Sign the hash
     signature = private_key.sign(
         hash_bytes,
-        padding.PSS(
-            mgf=padding.MGF1(hashes.SHA256()),
-            salt_length=padding.PSS.MAX_LENGTH
-        ),
-        hashes.SHA256()
+        _PSS_PADDING,
+        _SHA256
     )
     
     # Encode signature to Base64 for storage
@@ -95,15 +113,20 @@ def verify_signature(file_hash: str, signature_b64: str, public_key_pem: str) ->
     Returns:
         True if signature is valid, False otherwise
     """
+    # Malformed input is rejected up front, without decoding or RSA work
+    if not _HEX_DIGEST.fullmatch(file_hash):
+        return False
+    
     try:
-        # Load public key
-        public_key = serialization.load_pem_public_key(
-            public_key_pem.encode('utf-8'),
-            backend=default_backend()
-        )
+        # Load public key (cached)
+        public_key = load_public_key(public_key_pem)
+        
+        # A signature is exactly one modulus long, so its Base64 length is fixed
+        if len(signature_b64) != (public_key.key_size // 8 + 2) // 3 * 4:
+            return False
         
         # Decode signature
-        signature = base64.b64decode(signature_b64)
+        signature = base64.b64decode(signature_b64, validate=True)
         
         # Convert hex hash to bytes
         hash_bytes = bytes.fromhex(file_hash)
@@ -112,14 +135,11 @@ def verify_signature(file_hash: str, signature_b64: str, public_key_pem: str) ->
         public_key.verify(
             signature,
             hash_bytes,
-            padding.PSS(
-                mgf=padding.MGF1(hashes.SHA256()),
-                salt_length=padding.PSS.MAX_LENGTH
-            ),
-            hashes.SHA256()
+            _PSS_PADDING,
+            _SHA256
         )
         
         return True
-    except Exception:
-        # Signature verification failed
+    except (InvalidSignature, ValueError):
+        # Forged/tampered signature, bad Base64 or unusable key
         return False
@@ -1,14 +1,23 @@
 """
 TOTP utilities for RFC 6238 compliant Time-based One-Time Password MFA.
-Uses pyotp library for TOTP generation and verification.
+Uses pyotp for secret generation; codes are computed with hmac/hashlib.
 """
 import pyotp
 import qrcode
-from io import BytesIO
 import base64
+import binascii
+import hashlib
+import hmac
+import time
+from functools import lru_cache
 from typing import Optional, Tuple
+from urllib.parse import quote
 from config import settings
 
+# RFC 6238 parameters used by authenticator apps (and pyotp's defaults)
+TOTP_PERIOD_SECONDS = 30
+TOTP_DIGITS = 6
+
 
 def generate_totp_secret() -> str:
     """
@@ -44,73 +53,151 @@ def get_totp_provisioning_uri(
     Returns:
         OTPAuth URI string suitable for QR code generation
     """
-    totp = pyotp.TOTP(secret)
-    uri = totp.provisioning_uri(
-        name=email,
-        issuer_name=issuer
-    )
-    return uri
+    # Same URI pyotp builds (label "issuer:account", default SHA1/6 digits/
+    # 30 s parameters omitted), formatted directly
+    return f"otpauth://totp/{quote(issuer)}:{quote(email)}?secret={secret}&issuer={quote(issuer, safe='')}"
 
 
 def generate_qr_code(provisioning_uri: str) -> str:
     """
     Generate QR code image for TOTP provisioning URI.
     
-    Returns Base64 encoded PNG image that can be displayed directly in browser.
+    Returns an SVG image that can be displayed directly in browser. The SVG
+    is written straight from the module matrix: no raster image, PNG
+    compression or Base64 step.
     
     Args:
         provisioning_uri: OTPAuth provisioning URI
         
     Returns:
-        Base64 encoded PNG image as data URL ready for HTML <img> tag
+        SVG image as data URL ready for HTML <img> tag
     """
+    # A fixed mask pattern skips qrcode's trial render of all 8 masks (most of
+    # the CPU cost); every mask is valid per ISO/IEC 18004, so scanning is unaffected
     qr = qrcode.QRCode(
         version=1,
         error_correction=qrcode.constants.ERROR_CORRECT_L,
-        box_size=10,
         border=4,
+        mask_pattern=0,
     )
     qr.add_data(provisioning_uri)
     qr.make(fit=True)
     
-    # Generate PIL image
-    img = qr.make_image(fill_color="black", back_color="white")
+    # One unit per module (quiet zone included); each horizontal run of dark
+    # modules becomes a 1-unit-wide stroke along the middle of its row
+    modules = qr.get_matrix()
+    size = len(modules)
+    runs = []
+    for y, row in enumerate(modules):
+        x = 0
+        while x < size:
+            if row[x]:
+                start = x
+                while x < size and row[x]:
+                    x += 1
+                runs.append(f"M{start} {y}.5h{x - start}")
+            else:
+                x += 1
+    
+    svg = (
+        f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {size} {size}" shape-rendering="crispEdges">'
+        f'<rect width="{size}" height="{size}" fill="#fff"/>'
+        f'<path stroke="#000" d="{"".join(runs)}"/></svg>'
+    )
+    
+    # Return as data URL for direct HTML embedding (only the characters a
+    # data URL can't carry are escaped)
+    return "data:image/svg+xml," + quote(svg, safe=' =":/')
+
+
+@lru_cache(maxsize=4096)
+def _totp_key(secret: str) -> bytes:
+    """
+    Decode a base32 TOTP secret into its HMAC key, memoized per process.
+    
+    Args:
+        secret: Base32 encoded TOTP secret (padding optional)
+        
+    Returns:
+        Raw HMAC-SHA1 key bytes
+    """
+    return base64.b32decode(secret + "=" * (-len(secret) % 8), casefold=True)
+
+
+def _hotp(key: bytes, counter: int) -> str:
+    """
+    RFC 4226 HOTP value for one counter (HMAC-SHA1, dynamic truncation).
+    
+    Args:
+        key: Raw HMAC key from _totp_key
+        counter: Time step (Unix time // TOTP_PERIOD_SECONDS)
+        
+    Returns:
+        Zero-padded TOTP_DIGITS-digit code
+    """
+    digest = hmac.new(key, counter.to_bytes(8, "big"), hashlib.sha1).digest()
+    offset = digest[-1] & 0x0F
+    code = int.from_bytes(digest[offset:offset + 4], "big") & 0x7FFFFFFF
+    return str(code % 10 ** TOTP_DIGITS).zfill(TOTP_DIGITS)
+
+
+def time_step(now: Optional[float] = None) -> int:
+    """
+    Current RFC 6238 time step (the HOTP counter).
     
-    # Convert to bytes
-    buffer = BytesIO()
-    img.save(buffer, format="PNG")
-    img_str = base64.b64encode(buffer.getvalue()).decode()
+    Handlers doing several TOTP operations can read it once and pass it on.
     
-    # Return as data URL for direct HTML embedding
-    return f"data:image/png;base64,{img_str}"
+    Args:
+        now: Unix time in seconds; defaults to the current wall-clock time
+        
+    Returns:
+        Number of whole periods since the Unix epoch
+    """
+    if now is None:
+        return time.time_ns() // (TOTP_PERIOD_SECONDS * 1_000_000_000)
+    return int(now) // TOTP_PERIOD_SECONDS
 
 
-def verify_totp_code(secret: str, code: str, window: int = 1) -> bool:
+def verify_totp_code(secret: str, code: str, window: int = 1, *, step: Optional[int] = None) -> bool:
     """
     Verify a TOTP code against the secret.
     
     Security features:
     - RFC 6238 compliant with 30-second time step
     - ±30 second time window tolerance for clock drift
+    - Constant-time comparison, with no early exit on a match
     - Prevents acceptance of already-used codes (when implemented with database)
     
+    Computed directly with hmac/hashlib (OpenSSL) rather than through a
+    pyotp.TOTP object per call; codes are identical to pyotp's.
+    
     Args:
         secret: Base32 encoded TOTP secret
         code: 6-digit code from authenticator app (string)
         window: Time window in steps (±30 sec per step). Default 1 = ±30 seconds
+        step: Time step from time_step(); read from the clock if omitted
         
     Returns:
         True if code is valid, False otherwise
     """
     try:
-        totp = pyotp.TOTP(secret)
-        # verify() checks current time ± window
-        return totp.verify(code, valid_window=window)
-    except Exception:
+        key = _totp_key(secret)
+    except (binascii.Error, ValueError):
         return False
+    
+    # Every candidate is computed and compared whatever the input, so the
+    # time taken doesn't depend on whether (or where) the code matched, or
+    # on whether it was well formed
+    well_formed = len(code) == TOTP_DIGITS and code.isascii() and code.isdigit()
+    code_bytes = code.encode()
+    counter = time_step() if step is None else step
+    matched = False
+    for candidate in range(counter - window, counter + window + 1):
+        matched |= hmac.compare_digest(_hotp(key, candidate).encode(), code_bytes)
+    return matched and well_formed
 
 
-def get_current_totp_code(secret: str) -> str:
+def get_current_totp_code(secret: str, *, step: Optional[int] = None) -> str:
     """
     Get the current valid TOTP code (for testing/debugging only).
     
@@ -118,9 +205,9 @@ def get_current_totp_code(secret: str) -> str:
     
     Args:
         secret: Base32 encoded TOTP secret
+        step: Time step from time_step(); read from the clock if omitted
         
     Returns:
         Current 6-digit TOTP code as string
     """
-    totp = pyotp.TOTP(secret)
-    return totp.now()
+    return _hotp(_totp_key(secret), time_step() if step is None else step)
@@ -0,0 +1,76 @@
+"""
+Small in-process cache with per-entry expiry.
+Used for short-lived, per-worker state that is cheap to rebuild on a miss.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+class TTLCache:
+    """
+    Bounded key/value cache whose entries expire after `ttl` seconds.
+    
+    - Thread-safe (sync routes run concurrently in the threadpool)
+    - Least recently used entries are evicted once `maxsize` is reached
+    - Expired entries are dropped lazily when read
+    """
+    
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        # Store: {key: (expires_at, value)}
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Look up a live entry.
+        
+        Args:
+            key: Cache key
+        
+        Returns:
+            Cached value, or None if missing or expired
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+    
+    def set(self, key: Hashable, value: Any) -> None:
+        """
+        Store a value for `ttl` seconds.
+        
+        Args:
+            key: Cache key
+            value: Value to cache
+        """
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+    
+    def pop(self, key: Hashable) -> Optional[Any]:
+        """
+        Remove an entry (e.g. after the underlying data changed).
+        
+        Args:
+            key: Cache key
+        
+        Returns:
+            The removed value, or None if missing or expired
+        """
+        with self._lock:
+            entry = self._data.pop(key, None)
+            if entry is None or entry[0] <= time.monotonic():
+                return None
+            return entry[1]